@@ -14,19 +14,50 @@ sys.path.append(SRC_PATH)
 from src.msr2026.rq1.run_rq1 import run_rq1
 from src.msr2026.rq2.run_rq2 import run_rq2
 from src.msr2026.rq3.run_rq3 import run_rq3
+from src.msr2026.session import AIDevSession
+from src.msr2026.utils.cache import RQ_FILES
+from src.msr2026.utils.prefetch import Prefetcher
+
+# Dataset root: hf:// (default), a local mirror, or a pr_id-clustered copy
+# (python -m src.msr2026.utils.layout), e.g. AIDEV_DATA_ROOT=../data/AIDev_clustered/
+DATA_ROOT = os.environ.get("AIDEV_DATA_ROOT", "hf://datasets/hao-li/AIDev/")
+
+# Optional RAM cap for shared machines, e.g. AIDEV_MEMORY_BUDGET=6GB
+MEMORY_BUDGET = os.environ.get("AIDEV_MEMORY_BUDGET") or None
+
+# Processes for RQ2 comment text processing (default: all cores)
+WORKERS = int(os.environ.get("AIDEV_WORKERS", os.cpu_count() or 1))
+
+# Set AIDEV_PREFETCH=1 to download all RQ files concurrently in the background
+# (resumable, into ../data/aidev_prefetch/) while earlier RQs compute
+PREFETCH = os.environ.get("AIDEV_PREFETCH", "") not in ("", "0")
 
 
 if __name__ == "__main__":
 
     print("\n================= MSR 2026 — Running All RQs =================\n")
 
-    run_rq1()
-    print("\n----------------- RQ1 Completed -----------------\n")
+    prefetcher = Prefetcher(DATA_ROOT).start() if PREFETCH else None
+
+    # One shared session: tables used by several RQs are loaded only once
+    session = AIDevSession(DATA_ROOT, memory_budget=MEMORY_BUDGET, workers=WORKERS, prefetcher=prefetcher)
+
+    try:
+        run_rq1(session=session)
+        print("\n----------------- RQ1 Completed -----------------\n")
 
-    run_rq2()
-    print("\n----------------- RQ2 Completed -----------------\n")
+        # Free what the next RQ does not read (spilled to disk under a budget)
+        session.release(keep=RQ_FILES["rq2"])
+        run_rq2(session=session)
+        print("\n----------------- RQ2 Completed -----------------\n")
 
-    run_rq3()
-    print("\n----------------- RQ3 Completed -----------------\n")
+        session.release(keep=RQ_FILES["rq3"])
+        run_rq3(session=session)
+        print("\n----------------- RQ3 Completed -----------------\n")
+    finally:
+        session.clear()
+        # Stops in-flight downloads too if an RQ failed (.part files stay resumable)
+        if prefetcher is not None:
+            prefetcher.shutdown()
 
     print("\n✔ All RQs Completed — Figures and Tables saved to /output\n")
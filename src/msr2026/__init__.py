@@ -6,5 +6,6 @@ Exposes RQ1, RQ2, RQ3 pipelines as importable modules.
 from .rq1.run_rq1 import run_rq1
 from .rq2.run_rq2 import run_rq2
 from .rq3.run_rq3 import run_rq3
+from .session import AIDevSession
 
-__all__ = ["run_rq1", "run_rq2", "run_rq3"]
+__all__ = ["run_rq1", "run_rq2", "run_rq3", "AIDevSession"]
@@ -8,7 +8,8 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-from src.msr2026.utils.plotting import save_fig
+from src.msr2026.utils.layout import is_clustered, stream_pr_aggregate
+from src.msr2026.utils.plotting import save_fig, figure_fingerprint, skip_if_fresh
 
 
 # ============================
@@ -29,13 +30,16 @@ os.makedirs(TABLE_DIR, exist_ok=True)
 # ============================
 # Data Loading
 # ============================
-def load_data():
-    """Load RQ1 datasets directly from HuggingFace (hf://)."""
+def load_data(data_root=DATA_ROOT, commits=True):
+    """
+    Load RQ1 datasets directly from HuggingFace (hf://) or a local mirror.
+    With ``commits=False`` pr_commit_details is skipped (returned as None).
+    """
     print("Loading RQ1 data from HuggingFace...")
 
-    all_pr = pd.read_parquet(f"{DATA_ROOT}all_pull_request.parquet")
-    commit = pd.read_parquet(f"{DATA_ROOT}pr_commit_details.parquet")
-    task_type = pd.read_parquet(f"{DATA_ROOT}pr_task_type.parquet")
+    all_pr = pd.read_parquet(f"{data_root}all_pull_request.parquet")
+    commit = pd.read_parquet(f"{data_root}pr_commit_details.parquet") if commits else None
+    task_type = pd.read_parquet(f"{data_root}pr_task_type.parquet")
 
     return all_pr, commit, task_type
 
@@ -46,7 +50,10 @@ def load_data():
 def extract_test_files(commit):
     """Mark test files and aggregate PR-level test indicators."""
     print("Extracting test file indicators...")
+    return aggregate_test_files(commit)
 
+
+def aggregate_test_files(commit):
     commit["is_test_file"] = commit["filename"].str.contains(TEST_PATTERN, regex=True, na=False)
     commit["test_file_count"] = commit["is_test_file"].astype(int)
 
@@ -61,6 +68,16 @@ def extract_test_files(commit):
     return pr_test_agg
 
 
+def stream_test_files(data_root):
+    """
+    ``extract_test_files`` over a pr_id-clustered pr_commit_details (see
+    ``utils.layout``), streamed PR-complete chunk by chunk instead of loading
+    and hash-grouping the whole table.
+    """
+    print("Streaming test file indicators from pr_id-clustered commits...")
+    return stream_pr_aggregate(data_root, "pr_commit_details", aggregate_test_files, columns=["filename"])
+
+
 def merge_pr_info(all_pr, pr_test_agg, task_type):
     """Merge PR metadata with test indicators and task types."""
     print("Merging PR-level data...")
@@ -81,17 +98,26 @@ def merge_pr_info(all_pr, pr_test_agg, task_type):
 # Plotting Helpers
 # ============================
 def plot_bar(df, x, y, title, xlabel, ylabel, fname):
+    fingerprint = figure_fingerprint(df, plot_bar, x=x, y=y, title=title, xlabel=xlabel, ylabel=ylabel)
+    if skip_if_fresh(FIG_DIR, fname, fingerprint):
+        return
+
     plt.figure(figsize=(8, 5))
     sns.barplot(data=df, x=x, y=y)
     plt.title(title, fontsize=14)
     plt.xlabel(xlabel)
     plt.ylabel(ylabel)
     plt.tight_layout()
-    save_fig(FIG_DIR, fname)
+    save_fig(FIG_DIR, fname, fingerprint)
 
 
 def plot_heatmap(df, title, fname, cmap_color="blue", cbar_label="Value"):
     """ACM low-saturation heatmap."""
+    fingerprint = figure_fingerprint(df, plot_heatmap, title=title, cmap_color=cmap_color,
+                                     cbar_label=cbar_label)
+    if skip_if_fresh(FIG_DIR, fname, fingerprint):
+        return
+
     plt.figure(figsize=(8, 4.2))
 
     cmap = sns.light_palette("#4C72B0" if cmap_color == "blue" else "#2C7A7B",
@@ -114,10 +140,14 @@ def plot_heatmap(df, title, fname, cmap_color="blue", cbar_label="Value"):
     plt.xticks(rotation=25, ha="right")
     plt.yticks(rotation=0)
     plt.tight_layout()
-    save_fig(FIG_DIR, fname)
+    save_fig(FIG_DIR, fname, fingerprint)
 
 
 def plot_rq1_three_panel(inc, avg, cond, fname):
+    fingerprint = figure_fingerprint(inc, avg, cond, plot_rq1_three_panel)
+    if skip_if_fresh(FIG_DIR, fname, fingerprint):
+        return
+
     fig, axes = plt.subplots(1, 3, figsize=(18, 5))
     plt.subplots_adjust(wspace=0.3)
 
@@ -134,7 +164,7 @@ def plot_rq1_three_panel(inc, avg, cond, fname):
         ax.set_ylabel("Agent")
 
     plt.tight_layout()
-    save_fig(FIG_DIR, fname)
+    save_fig(FIG_DIR, fname, fingerprint)
 
 
 # ============================
@@ -171,17 +201,23 @@ def compute_agent_metrics(pr_df):
 # ============================
 # MAIN ENTRYPOINT
 # ============================
-def run_rq1():
+def run_rq1(session=None, data_root=DATA_ROOT):
     print("\n===================== Running RQ1 =====================")
 
-    # Load data
-    all_pr, commit, task_type = load_data()
+    if session is None:
+        clustered = is_clustered(data_root, "pr_commit_details")
+
+        # Load data
+        all_pr, commit, task_type = load_data(data_root, commits=not clustered)
 
-    # Extract test indicators
-    pr_test = extract_test_files(commit)
+        # Extract test indicators
+        pr_test = stream_test_files(data_root) if clustered else extract_test_files(commit)
 
-    # Merge PR-level metadata
-    pr_df = merge_pr_info(all_pr, pr_test, task_type)
+        # Merge PR-level metadata
+        pr_df = merge_pr_info(all_pr, pr_test, task_type)
+        del all_pr, commit, task_type, pr_test
+    else:
+        pr_df = session["rq1_pr"]
 
     # Compute metrics
     inclusion, avg_test, conditional = compute_agent_metrics(pr_df)
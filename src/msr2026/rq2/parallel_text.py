@@ -0,0 +1,102 @@
+# ================================================================
+# RQ2 — Parallel Comment Cleaning & Classification over Arrow Chunks
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ================================================================
+#
+# The comment column is split into Arrow chunks that are filtered and
+# classified in a process pool. Workers apply exactly the same stage masks
+# and rules as the sequential ``clean_comments`` → ``apply_comment_rules``
+# path, and chunk results are merged back in original row order, so the
+# output is identical to the sequential pipeline.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.msr2026.rq2.run_rq2 import stage1_mask, stage2_mask, classify_comments
+
+
+# ============================
+# Constants
+# ============================
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Workers are not forked from the pipeline process: with AIDEV_PREFETCH=1 its
+# download threads are alive, and forking a multi-threaded process can copy
+# locks held by those threads into the children.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+# ============================
+# Worker
+# ============================
+def _process_chunk(bodies):
+    """
+    Filter and classify one Arrow chunk of raw comment bodies.
+    Returns the keep mask, the stage-1 survivor count, and Arrow arrays of
+    first_line / short_body / comment_type for the kept rows.
+    """
+    text = pd.Series(bodies.to_numpy(zero_copy_only=False), dtype=object).fillna("").astype(str)
+
+    mask1 = stage1_mask(text).to_numpy()
+    keep = mask1.copy()
+    keep[mask1] = stage2_mask(text[mask1]).to_numpy()
+
+    first_line = text[keep].str.split("\n").str[0]
+    short_body = first_line.str.slice(0, 300)
+    comment_type = classify_comments(short_body)
+
+    return (
+        keep,
+        int(mask1.sum()),
+        pa.array(first_line, type=pa.string()),
+        pa.array(short_body, type=pa.string()),
+        pa.array(comment_type, type=pa.string()),
+    )
+
+
+def _iter_chunks(bodies, chunk_size):
+    for start in range(0, len(bodies), chunk_size):
+        yield bodies.slice(start, chunk_size)
+
+
+# ============================
+# Parallel Pipeline
+# ============================
+def clean_and_classify_parallel(df, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parallel equivalent of ``apply_comment_rules(clean_comments(df))``.
+    Unlike the sequential version, ``df`` itself is not modified.
+    """
+    workers = workers or os.cpu_count() or 1
+    bodies = pa.array(df["body"].astype(object), from_pandas=True, type=pa.string())
+    chunks = list(_iter_chunks(bodies, chunk_size))
+
+    print(f"\n=== Cleaning & classifying {len(df):,} comments "
+          f"({len(chunks)} chunks, {workers} workers) ===")
+
+    if workers == 1 or len(chunks) <= 1:
+        results = [_process_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=multiprocessing.get_context(START_METHOD)) as pool:
+            results = list(pool.map(_process_chunk, chunks))
+
+    keep = np.concatenate([r[0] for r in results]) if results else np.zeros(0, dtype=bool)
+    print(f"After Stage 1: {sum(r[1] for r in results):,} comments")
+    print(f"After Stage 2: {int(keep.sum()):,} comments")
+
+    filtered = df[keep].copy()
+    filtered["comment_body"] = filtered["body"].fillna("").astype(str)
+    # Parsed on the full column, as in the sequential path, so format inference matches
+    filtered["comment_time"] = pd.to_datetime(df["created_at"], errors="coerce")[keep]
+
+    for col, pos in (("first_line", 2), ("short_body", 3), ("comment_type", 4)):
+        merged = pa.chunked_array([r[pos] for r in results], type=pa.string())
+        filtered[col] = pd.Series(merged.to_numpy(), index=filtered.index, dtype=object)
+
+    return filtered
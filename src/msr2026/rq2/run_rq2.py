@@ -9,7 +9,8 @@ import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-from src.msr2026.utils.plotting import save_fig
+from src.msr2026.utils.layout import is_clustered, load_pr_index
+from src.msr2026.utils.plotting import save_fig, figure_fingerprint, skip_if_fresh
 
 
 
@@ -29,10 +30,8 @@ ACM_STACK_COLORS = [
     "#5c80b1",
 ]
 
-HEATMAP_CMAP = sns.blend_palette(
-    ["#f1f4fb", "#d6e0f3", "#b0c4e4", "#4c72b0"],
-    as_cmap=True
-)
+HEATMAP_COLORS = ["#f1f4fb", "#d6e0f3", "#b0c4e4", "#4c72b0"]
+HEATMAP_CMAP = sns.blend_palette(HEATMAP_COLORS, as_cmap=True)
 
 # Ensure directories exist
 os.makedirs(FIG_DIR, exist_ok=True)
@@ -42,48 +41,76 @@ os.makedirs(TABLE_DIR, exist_ok=True)
 # ============================
 # Helper Functions
 # ============================
-def load_rq2_data():
+def load_rq2_data(data_root=DATA_ROOT, commits=True):
+    """With ``commits=False`` pr_commits is skipped (returned as None)."""
     print("Loading RQ2 data from HuggingFace...")
 
-    pr_review_comments_v2 = pd.read_parquet(f"{DATA_ROOT}pr_review_comments_v2.parquet")
-    all_pull_request = pd.read_parquet(f"{DATA_ROOT}all_pull_request.parquet")[["id", "number", "agent"]]
-    pr_reviews = pd.read_parquet(f"{DATA_ROOT}pr_reviews.parquet")[["id", "pr_id"]]
-    pr_commits = pd.read_parquet(f"{DATA_ROOT}pr_commits.parquet")[["pr_id", "sha"]]
+    pr_review_comments_v2 = pd.read_parquet(f"{data_root}pr_review_comments_v2.parquet")
+    all_pull_request, pr_reviews, pr_commits = select_rq2_columns(
+        pd.read_parquet(f"{data_root}all_pull_request.parquet"),
+        pd.read_parquet(f"{data_root}pr_reviews.parquet"),
+        pd.read_parquet(f"{data_root}pr_commits.parquet") if commits else None,
+    )
+
+    return pr_review_comments_v2, all_pull_request, pr_reviews, pr_commits
+
+
+def select_rq2_columns(all_pull_request, pr_reviews, pr_commits):
+    """Project the RQ2 columns and align join keys to nullable integers."""
+    all_pull_request = all_pull_request[["id", "number", "agent"]].copy()
+    pr_reviews = pr_reviews[["id", "pr_id"]].copy()
 
     # Type conversions
     all_pull_request["id"] = all_pull_request["id"].astype("Int64")
     pr_reviews["pr_id"] = pr_reviews["pr_id"].astype("Int64")
-    pr_commits["pr_id"] = pr_commits["pr_id"].astype("Int64")
 
-    return pr_review_comments_v2, all_pull_request, pr_reviews, pr_commits
+    if pr_commits is not None:
+        pr_commits = pr_commits[["pr_id", "sha"]].copy()
+        pr_commits["pr_id"] = pr_commits["pr_id"].astype("Int64")
+
+    return all_pull_request, pr_reviews, pr_commits
 
 
 # ============================
 # Comment Cleaning Pipeline
 # ============================
-def clean_comments(df):
-    print("\n=== Cleaning Stage 1 ===")
-    df["comment_body"] = df["body"].fillna("").astype(str)
-    df["comment_time"] = pd.to_datetime(df["created_at"], errors="coerce")
+def merge_review_metadata(pr_review_comments_v2, all_pr, pr_reviews):
+    """Map review comments to their PR and attach PR metadata (agent)."""
+    # Map comments → PR ID (already attached in the pr_id-clustered layout)
+    if "pr_id" in pr_review_comments_v2.columns:
+        reviews = pr_review_comments_v2
+    else:
+        reviews = pr_review_comments_v2.merge(
+            pr_reviews.rename(columns={"id": "pull_request_review_id"}),
+            on="pull_request_review_id",
+            how="left",
+        )
 
-    text = df["comment_body"]
+    # Merge PR metadata
+    reviews = reviews.merge(
+        all_pr.rename(columns={"id": "pr_id"}),
+        on="pr_id",
+        how="left",
+    )
+    reviews["agent"] = reviews["agent"].fillna("Unknown")
 
-    # Stage 1 Filter
-    mask1 = (
+    return reviews
+
+
+def stage1_mask(text):
+    """Stage 1: drop diff fragments, code/markup and texts without real words."""
+    return (
         text.str.contains(r"[A-Za-z]{3,}", na=False)
         & (text.str.len() < 3000)
         & (~text.str.startswith(("+", "-"), na=False))
         & (~text.str.contains(r"^@@", regex=True, na=False))
         & (~text.str.contains(r"[{}<>]", na=False))
     )
-    filtered = df[mask1].copy()
-    print(f"After Stage 1: {len(filtered):,} comments")
 
-    # Stage 2 Filter
-    print("\n=== Cleaning Stage 2 ===")
-    text = filtered["comment_body"]
 
-    mask2 = (
+def stage2_mask(text):
+    """Stage 2: drop bot comments, links, logs and texts shorter than two words."""
+    return (
         ~text.str.contains("dependabot|github-actions|renovate|codecov", case=False, na=False)
         & ~text.str.contains(r"http[s]?://", na=False)
         & ~text.str.contains(r"traceback|exception|error:|failed|stack trace", case=False, na=False)
@@ -92,6 +119,21 @@ def clean_comments(df):
         & text.str.contains(r"[A-Za-z]{3,}\s+[A-Za-z]{3,}", na=False)
     )
 
+
+def clean_comments(df):
+    print("\n=== Cleaning Stage 1 ===")
+    df["comment_body"] = df["body"].fillna("").astype(str)
+    df["comment_time"] = pd.to_datetime(df["created_at"], errors="coerce")
+
+    # Stage 1 Filter
+    mask1 = stage1_mask(df["comment_body"])
+    filtered = df[mask1].copy()
+    print(f"After Stage 1: {len(filtered):,} comments")
+
+    # Stage 2 Filter
+    print("\n=== Cleaning Stage 2 ===")
+    mask2 = stage2_mask(filtered["comment_body"])
+
     filtered2 = filtered[mask2].copy()
     print(f"After Stage 2: {len(filtered2):,} comments")
 
@@ -104,26 +146,117 @@ def clean_comments(df):
 # ============================
 # Rule-based Classification
 # ============================
+COMMENT_RULES = {
+    "correctness": r"\b(fix|bug|issue|error|wrong|incorrect|null|edge case)\b",
+    "style": r"\b(style|format|indent|pep8|naming)\b",
+    "documentation": r"\b(doc|readme|comment|description|explain)\b",
+    "testing": r"\b(test|coverage|unit test)\b",
+    "security": r"\b(security|vulnerable|sanitize|injection|escape)\b",
+}
+
+
+def classify_comments(short_body):
+    """Label each comment; later rules take precedence over earlier ones."""
+    comment_type = pd.Series("other", index=short_body.index, dtype=object)
+
+    for label, pattern in COMMENT_RULES.items():
+        comment_type[short_body.str.contains(pattern, case=False, regex=True, na=False)] = label
+
+    return comment_type
+
+
 def apply_comment_rules(df):
     print("\n=== Classifying comments ===")
 
-    rules = {
-        "correctness": r"\b(fix|bug|issue|error|wrong|incorrect|null|edge case)\b",
-        "style": r"\b(style|format|indent|pep8|naming)\b",
-        "documentation": r"\b(doc|readme|comment|description|explain)\b",
-        "testing": r"\b(test|coverage|unit test)\b",
-        "security": r"\b(security|vulnerable|sanitize|injection|escape)\b",
-    }
+    df["comment_type"] = classify_comments(df["short_body"])
 
-    df["comment_type"] = "other"
+    return df
 
-    for label, pattern in rules.items():
-        df.loc[
-            df["short_body"].str.contains(pattern, case=False, regex=True, na=False),
-            "comment_type",
-        ] = label
 
-    return df
+# ============================
+# Resolution Signal
+# ============================
+def count_commits(pr_commits):
+    """Commits per PR (pr_id, commit_count)."""
+    return (
+        pr_commits.groupby("pr_id")["sha"]
+        .count()
+        .reset_index()
+        .rename(columns={"sha": "commit_count"})
+    )
+
+
+def indexed_commit_counts(data_root):
+    """
+    ``count_commits`` of a pr_id-clustered pr_commits, read from its sidecar
+    row-range index (``stop - start`` rows per PR) without loading the table.
+    """
+    index = load_pr_index(data_root, "pr_commits")
+    return pd.DataFrame({
+        "pr_id": index["pr_id"].astype("Int64"),
+        "commit_count": index["stop"] - index["start"],
+    })
+
+
+def attach_resolution(classified, pr_commits, commit_count=None):
+    """
+    Flag a comment as resolved when its PR received follow-up commits.
+    ``commit_count`` (see ``indexed_commit_counts``) replaces counting ``pr_commits``.
+    """
+    if commit_count is None:
+        commit_count = count_commits(pr_commits)
+
+    classified = classified.merge(commit_count, on="pr_id", how="left")
+    classified["commit_count"] = classified["commit_count"].fillna(0)
+    classified["resolved"] = classified["commit_count"] > 1
+
+    return classified
+
+
+def build_classified_comments(pr_review_comments_v2, all_pr, pr_reviews, pr_commits, workers=1,
+                              commit_count=None):
+    """
+    Full comment pipeline: PR mapping → cleaning → rule classification → resolution.
+    With ``workers > 1`` (or ``None`` for all cores), text processing runs in a
+    process pool over Arrow chunks and yields the same result.
+    """
+    reviews = merge_review_metadata(pr_review_comments_v2, all_pr, pr_reviews)
+
+    if workers == 1:
+        classified = apply_comment_rules(clean_comments(reviews))
+    else:
+        from src.msr2026.rq2.parallel_text import clean_and_classify_parallel
+        classified = clean_and_classify_parallel(reviews, workers=workers)
+    del reviews
+
+    return attach_resolution(classified, pr_commits, commit_count)
+
+
+# ============================
+# Agent × Comment-Type Tables
+# ============================
+def compute_type_distribution(classified):
+    """Raw counts, counts without "other", and row-normalized shares per agent."""
+    type_counts = (
+        classified.groupby("agent")["comment_type"]
+        .value_counts()
+        .unstack(fill_value=0)
+    )
+
+    # Exclude "other"
+    plot_type_counts = type_counts.drop(columns=["other"], errors="ignore")
+    type_counts_pct = plot_type_counts.div(plot_type_counts.sum(axis=1), axis=0)
+
+    return type_counts, plot_type_counts, type_counts_pct
+
+
+def compute_resolution_matrix(classified):
+    """Share of resolved comments per agent × comment type."""
+    return (
+        classified.groupby(["agent", "comment_type"])["resolved"]
+        .mean()
+        .unstack(fill_value=0)
+    )
 
 
 # ============================
@@ -131,6 +264,10 @@ def apply_comment_rules(df):
 # ============================
 def plot_stacked_type_distribution(type_counts_pct):
     print("\n=== Generating Figure 1b — Normalized Comment Distribution ===")
+    fingerprint = figure_fingerprint(type_counts_pct, plot_stacked_type_distribution,
+                                     colors=ACM_STACK_COLORS)
+    if skip_if_fresh(FIG_DIR, "rq2_comment_distribution", fingerprint):
+        return
 
     fig, ax = plt.subplots(figsize=(10, 6))
     bottom = np.zeros(len(type_counts_pct))
@@ -161,7 +298,7 @@ def plot_stacked_type_distribution(type_counts_pct):
     )
 
     plt.tight_layout()
-    save_fig(FIG_DIR, "rq2_comment_distribution")
+    save_fig(FIG_DIR, "rq2_comment_distribution", fingerprint)
 
 
 # ============================
@@ -169,6 +306,10 @@ def plot_stacked_type_distribution(type_counts_pct):
 # ============================
 def plot_resolution_heatmap(correction_stats):
     print("\n=== Generating Figure 2 — Resolution Heatmap ===")
+    fingerprint = figure_fingerprint(correction_stats, plot_resolution_heatmap,
+                                     colors=HEATMAP_COLORS)
+    if skip_if_fresh(FIG_DIR, "rq2_resolution_heatmap", fingerprint):
+        return
 
     plt.figure(figsize=(9, 5))
     sns.heatmap(
@@ -188,49 +329,28 @@ def plot_resolution_heatmap(correction_stats):
     plt.yticks(rotation=0)
 
     plt.tight_layout()
-    save_fig(FIG_DIR, "rq2_resolution_heatmap")
+    save_fig(FIG_DIR, "rq2_resolution_heatmap", fingerprint)
 
 
 # ============================
 # MAIN ENTRYPOINT
 # ============================
-def run_rq2():
+def run_rq2(session=None, workers=1, data_root=DATA_ROOT):
     print("\n===================== Running RQ2 =====================")
 
-    # 1. Load data
-    pr_review_comments_v2, all_pr, pr_reviews, pr_commits = load_rq2_data()
-
-    # 2. Map comments → PR ID
-    reviews = pr_review_comments_v2.merge(
-        pr_reviews.rename(columns={"id": "pull_request_review_id"}),
-        on="pull_request_review_id",
-        how="left",
-    )
-
-    # 3. Merge PR metadata
-    reviews = reviews.merge(
-        all_pr.rename(columns={"id": "pr_id"}),
-        on="pr_id",
-        how="left",
-    )
-    reviews["agent"] = reviews["agent"].fillna("Unknown")
-
-    # 4. Clean comments
-    cleaned = clean_comments(reviews)
-
-    # 5. Apply rules
-    classified = apply_comment_rules(cleaned)
+    # 1–5. Load data, map comments → PRs, clean, classify, attach resolution signal
+    if session is None:
+        # Commit counts of a pr_id-clustered root come from the pr_commits index
+        clustered = is_clustered(data_root, "pr_commits")
+        commit_count = indexed_commit_counts(data_root) if clustered else None
+        classified = build_classified_comments(
+            *load_rq2_data(data_root, commits=not clustered), workers=workers, commit_count=commit_count
+        )
+    else:
+        classified = session["rq2_comments"]
 
     # 6. Count by agent × comment type
-    type_counts = (
-        classified.groupby("agent")["comment_type"]
-        .value_counts()
-        .unstack(fill_value=0)
-    )
-
-    # Exclude "other"
-    plot_type_counts = type_counts.drop(columns=["other"], errors="ignore")
-    type_counts_pct = plot_type_counts.div(plot_type_counts.sum(axis=1), axis=0)
+    type_counts, plot_type_counts, type_counts_pct = compute_type_distribution(classified)
 
     # ---- Save CSV files ----
     print("\nSaving CSV outputs...")
@@ -244,23 +364,8 @@ def run_rq2():
     # 7. Plot normalized distribution
     plot_stacked_type_distribution(type_counts_pct)
 
-    # 8. Compute resolution signal
-    commit_count = (
-        pr_commits.groupby("pr_id")["sha"]
-        .count()
-        .reset_index()
-        .rename(columns={"sha": "commit_count"})
-    )
-
-    classified = classified.merge(commit_count, on="pr_id", how="left")
-    classified["commit_count"] = classified["commit_count"].fillna(0)
-    classified["resolved"] = classified["commit_count"] > 1
-
-    correction_stats = (
-        classified.groupby(["agent", "comment_type"])["resolved"]
-        .mean()
-        .unstack(fill_value=0)
-    )
+    # 8. Resolution rate by agent × comment type
+    correction_stats = compute_resolution_matrix(classified)
 
     correction_stats.to_csv(f"{TABLE_DIR}/rq2_resolution_matrix.csv")
     print("✔ Resolution matrix saved.")
@@ -0,0 +1,229 @@
+# ============================================================
+# RQ3 — Batched Early-Acceptance Model over the Feature Store
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ============================================================
+#
+# L2-regularized logistic regression on log1p-scaled, standardized features
+# (fit with L-BFGS from scipy), k-fold cross-validation with folds evaluated
+# in parallel, and vectorized batch scoring of incoming PRs.
+#
+# Usage:
+#   python -m src.msr2026.rq3.acceptance_model --folds 5
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+from scipy.special import expit
+from scipy.stats import rankdata
+
+from src.msr2026.rq3.feature_store import FEATURE_STORE_PATH, FeatureStore
+from src.msr2026.rq3.run_rq3 import TABLE_DIR
+from src.msr2026.session import AIDevSession
+
+
+# ============================================================
+# Constants
+# ============================================================
+DEFAULT_L2 = 1.0
+DEFAULT_FOLDS = 5
+SCORE_BATCH_SIZE = 100_000
+MODEL_PATH = f"{TABLE_DIR}/rq3_acceptance_model.json"
+
+
+# ============================================================
+# Model
+# ============================================================
+class AcceptanceModel:
+    """Logistic acceptance model; ``predict_proba`` scores whole matrices at once."""
+
+    def __init__(self, l2=DEFAULT_L2, columns=None, versions=None):
+        self.l2 = l2
+        self.columns = columns
+        self.versions = versions
+        self.mean_ = None
+        self.scale_ = None
+        self.coef_ = None
+        self.intercept_ = 0.0
+
+    # ---------- preprocessing ----------
+    @staticmethod
+    def _transform(X):
+        # Count/length features are heavy-tailed (cf. RQ3 log-boxplots)
+        return np.log1p(np.clip(X, 0, None))
+
+    def _design(self, X):
+        return (self._transform(X) - self.mean_) / self.scale_
+
+    # ---------- training ----------
+    def fit(self, X, y):
+        Z = self._transform(np.asarray(X, dtype="float64"))
+        self.mean_ = Z.mean(axis=0)
+        self.scale_ = Z.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+        Z = (Z - self.mean_) / self.scale_
+        y = np.asarray(y, dtype="float64")
+        n = len(y)
+
+        def loss_and_grad(w):
+            b, coef = w[0], w[1:]
+            logits = Z @ coef + b
+            # log(1 + e^z) - y*z, numerically stable
+            loss = np.logaddexp(0, logits).sum() - y @ logits
+            residual = expit(logits) - y
+            loss = loss / n + 0.5 * self.l2 * coef @ coef / n
+            grad = np.concatenate([[residual.sum()], Z.T @ residual + self.l2 * coef]) / n
+            return loss, grad
+
+        result = minimize(loss_and_grad, np.zeros(Z.shape[1] + 1), jac=True, method="L-BFGS-B")
+        self.intercept_, self.coef_ = float(result.x[0]), result.x[1:]
+        return self
+
+    def fit_store(self, store):
+        self.columns, self.versions = store.columns, store.versions
+        return self.fit(store.X, store.accepted)
+
+    # ---------- scoring ----------
+    def predict_proba(self, X):
+        return expit(self._design(np.asarray(X, dtype="float64")) @ self.coef_ + self.intercept_)
+
+    def score_batches(self, X, batch_size=SCORE_BATCH_SIZE):
+        """Score a large matrix in fixed-size batches to bound temporary memory."""
+        X = np.asarray(X, dtype="float64")
+        out = np.empty(len(X))
+        for start in range(0, len(X), batch_size):
+            out[start:start + batch_size] = self.predict_proba(X[start:start + batch_size])
+        return out
+
+    def score_store(self, store, pr_ids=None, batch_size=SCORE_BATCH_SIZE):
+        """Score PRs of a feature store built with the same feature definitions."""
+        if self.versions is not None and store.versions != self.versions:
+            raise ValueError("feature store and model were built from different feature definitions")
+        return self.score_batches(store.matrix(pr_ids, self.columns), batch_size)
+
+    # ---------- persistence ----------
+    def coefficients(self):
+        return pd.DataFrame({"feature": self.columns, "coef": self.coef_})
+
+    def save(self, path=MODEL_PATH):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "l2": self.l2,
+                "columns": self.columns,
+                "versions": self.versions,
+                "mean": self.mean_.tolist(),
+                "scale": self.scale_.tolist(),
+                "coef": self.coef_.tolist(),
+                "intercept": self.intercept_,
+            }, f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        model = cls(l2=state["l2"], columns=state["columns"], versions=state["versions"])
+        model.mean_ = np.asarray(state["mean"])
+        model.scale_ = np.asarray(state["scale"])
+        model.coef_ = np.asarray(state["coef"])
+        model.intercept_ = state["intercept"]
+        return model
+
+
+# ============================================================
+# Evaluation
+# ============================================================
+def roc_auc(y, p):
+    """AUC via the Mann–Whitney U statistic (ties get average ranks)."""
+    y = np.asarray(y).astype(bool)
+    n_pos, n_neg = y.sum(), (~y).sum()
+    if n_pos == 0 or n_neg == 0:
+        return np.nan
+    ranks = rankdata(p)
+    return (ranks[y].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+
+def _evaluate_fold(X, y, train_idx, test_idx, l2):
+    model = AcceptanceModel(l2=l2).fit(X[train_idx], y[train_idx])
+    p = model.predict_proba(X[test_idx])
+    y_test = y[test_idx]
+    eps = 1e-12
+    return {
+        "n_test": len(test_idx),
+        "auc": roc_auc(y_test, p),
+        "log_loss": float(-np.mean(y_test * np.log(p + eps) + (1 - y_test) * np.log(1 - p + eps))),
+        "accuracy": float(np.mean((p >= 0.5) == y_test)),
+    }
+
+
+def stratified_folds(y, k=DEFAULT_FOLDS, seed=0):
+    """Assign each row to one of ``k`` folds, preserving the class balance."""
+    rng = np.random.default_rng(seed)
+    fold = np.empty(len(y), dtype=int)
+    for cls in np.unique(y):
+        idx = rng.permutation(np.flatnonzero(y == cls))
+        fold[idx] = np.arange(len(idx)) % k
+    return fold
+
+
+def cross_validate(X, y, k=DEFAULT_FOLDS, l2=DEFAULT_L2, seed=0, processes=None):
+    """k-fold cross-validation with folds fitted in parallel processes."""
+    X = np.asarray(X, dtype="float64")
+    y = np.asarray(y, dtype="int8")
+    fold = stratified_folds(y, k, seed)
+    splits = [(np.flatnonzero(fold != i), np.flatnonzero(fold == i)) for i in range(k)]
+
+    processes = processes or min(k, os.cpu_count() or 1)
+    if processes == 1:
+        results = [_evaluate_fold(X, y, tr, te, l2) for tr, te in splits]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(_evaluate_fold, X, y, tr, te, l2) for tr, te in splits]
+            results = [f.result() for f in futures]
+
+    return pd.DataFrame(results).rename_axis("fold").reset_index()
+
+
+# ============================================================
+# MAIN ENTRYPOINT
+# ============================================================
+def run_acceptance_model(session=None, folds=DEFAULT_FOLDS, l2=DEFAULT_L2, processes=None):
+    print("\n============ Running RQ3 Acceptance Model ============")
+
+    if session is None:
+        session = AIDevSession()
+
+    store = FeatureStore.from_session(session)
+    store.save(FEATURE_STORE_PATH)
+    print(f"✔ Feature store ({len(store):,} PRs × {len(store.columns)} features) saved to:",
+          FEATURE_STORE_PATH)
+
+    cv = cross_validate(store.X, store.accepted, k=folds, l2=l2, processes=processes)
+    cv.to_csv(f"{TABLE_DIR}/rq3_model_cv.csv", index=False)
+    print(cv)
+    print(f"Mean AUC: {cv['auc'].mean():.3f}")
+
+    model = AcceptanceModel(l2=l2).fit_store(store)
+    model.coefficients().to_csv(f"{TABLE_DIR}/rq3_model_coefficients.csv", index=False)
+    model.save(MODEL_PATH)
+    print("✔ Acceptance model saved to:", MODEL_PATH)
+
+    return model, cv
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit and cross-validate the RQ3 acceptance model.")
+    parser.add_argument("--folds", type=int, default=DEFAULT_FOLDS)
+    parser.add_argument("--l2", type=float, default=DEFAULT_L2)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    run_acceptance_model(folds=args.folds, l2=args.l2, processes=args.processes)
+
+
+if __name__ == "__main__":
+    main()
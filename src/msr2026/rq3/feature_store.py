@@ -0,0 +1,190 @@
+# ============================================================
+# RQ3 — Columnar Feature Store for Early-Acceptance Modelling
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ============================================================
+#
+# A dense float64 feature matrix keyed by sorted pr_id, built from the RQ3
+# features plus RQ1 test-file counts and RQ2 review-comment category counts.
+# Every feature carries a definition version; stores persisted as Parquet
+# record them in the schema metadata so stale stores/models are detected.
+
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.msr2026.rq1.run_rq1 import extract_test_files
+from src.msr2026.rq2.run_rq2 import COMMENT_RULES
+from src.msr2026.rq3.run_rq3 import TABLE_DIR, compute_features
+
+
+# ============================================================
+# Feature Definitions (bump a version when its definition changes)
+# ============================================================
+COMMENT_TYPES = list(COMMENT_RULES) + ["other"]
+
+FEATURES = {
+    "desc_length": {"version": 1, "source": "rq3", "doc": "PR description length (characters)"},
+    "churn": {"version": 1, "source": "rq3", "doc": "Total added + deleted lines"},
+    "files_changed": {"version": 1, "source": "rq3", "doc": "Distinct files touched"},
+    "is_test": {"version": 1, "source": "rq3", "doc": "Touches at least one test file"},
+    "test_file_count": {"version": 1, "source": "rq1", "doc": "Test files touched (RQ1 pattern)"},
+    **{
+        f"review_{ctype}": {"version": 1, "source": "rq2", "doc": f"Cleaned '{ctype}' review comments"}
+        for ctype in COMMENT_TYPES
+    },
+}
+
+FEATURE_STORE_PATH = f"{TABLE_DIR}/rq3_feature_store.parquet"
+
+
+def feature_versions(columns=None):
+    return {name: FEATURES[name]["version"] for name in (columns or FEATURES)}
+
+
+# ============================================================
+# Feature Construction
+# ============================================================
+def build_feature_frame(pull_request, pr_commit_details, classified_comments=None, rq3_features=None):
+    """
+    RQ3 features of AI-authored PRs joined with RQ1/RQ2 per-PR counts.
+    ``rq3_features`` reuses an already computed ``compute_features`` frame.
+    """
+    final = rq3_features if rq3_features is not None else compute_features(pull_request, pr_commit_details)
+
+    test_counts = extract_test_files(pr_commit_details[["pr_id", "filename"]].copy())
+    final = final.merge(test_counts[["pr_id", "test_file_count"]], on="pr_id", how="left")
+
+    if classified_comments is not None:
+        review_counts = (
+            classified_comments.groupby(["pr_id", "comment_type"])
+            .size()
+            .unstack(fill_value=0)
+            .reindex(columns=COMMENT_TYPES, fill_value=0)
+            .add_prefix("review_")
+            .reset_index()
+        )
+        review_counts["pr_id"] = review_counts["pr_id"].astype(final["pr_id"].dtype)
+        final = final.merge(review_counts, on="pr_id", how="left")
+    else:
+        for ctype in COMMENT_TYPES:
+            final[f"review_{ctype}"] = 0
+
+    return final.fillna({name: 0 for name in FEATURES})
+
+
+# ============================================================
+# Feature Store
+# ============================================================
+class FeatureStore:
+    """
+    Feature matrix ``X`` (n_prs × n_features, float64) with rows keyed by
+    sorted ``pr_ids``, plus ``agents`` and (for historical PRs) ``accepted``.
+    """
+
+    def __init__(self, pr_ids, X, columns, agents=None, accepted=None, versions=None):
+        order = np.argsort(pr_ids, kind="stable")
+        self.pr_ids = np.asarray(pr_ids, dtype="int64")[order]
+        self.X = np.ascontiguousarray(np.asarray(X, dtype="float64")[order])
+        self.columns = list(columns)
+        self.agents = None if agents is None else np.asarray(agents, dtype=object)[order]
+        self.accepted = None if accepted is None else np.asarray(accepted, dtype="int8")[order]
+        self.versions = versions or feature_versions(self.columns)
+
+    def __len__(self):
+        return len(self.pr_ids)
+
+    # ---------- construction ----------
+    @classmethod
+    def from_frame(cls, frame, columns=None):
+        columns = list(columns or FEATURES)
+        return cls(
+            frame["pr_id"].to_numpy(dtype="int64"),
+            frame[columns].to_numpy(dtype="float64"),
+            columns,
+            agents=frame["agent"].to_numpy() if "agent" in frame else None,
+            accepted=frame["accepted"].to_numpy() if "accepted" in frame else None,
+        )
+
+    @classmethod
+    def build(cls, pull_request, pr_commit_details, classified_comments=None):
+        print("Building RQ3 feature store...")
+        return cls.from_frame(build_feature_frame(pull_request, pr_commit_details, classified_comments))
+
+    @classmethod
+    def from_session(cls, session):
+        """Build from a session, reusing its memoized RQ3 features and RQ2 comments."""
+        print("Building RQ3 feature store...")
+        return cls.from_frame(build_feature_frame(
+            None, session["pr_commit_details"], session["rq2_comments"],
+            rq3_features=session["rq3_features"],
+        ))
+
+    # ---------- access ----------
+    def rows(self, pr_ids):
+        """Vectorized pr_id → row lookup; raises KeyError for unknown PRs."""
+        pr_ids = np.asarray(pr_ids, dtype="int64")
+        if len(self.pr_ids) == 0:
+            if len(pr_ids):
+                raise KeyError(f"unknown pr_id(s): {pr_ids[:10].tolist()}")
+            return np.empty(0, dtype="intp")
+        pos = np.searchsorted(self.pr_ids, pr_ids)
+        pos_clipped = np.minimum(pos, len(self.pr_ids) - 1)
+        missing = (pos >= len(self.pr_ids)) | (self.pr_ids[pos_clipped] != pr_ids)
+        if missing.any():
+            raise KeyError(f"unknown pr_id(s): {pr_ids[missing][:10].tolist()}")
+        return pos
+
+    def matrix(self, pr_ids=None, columns=None):
+        X = self.X if pr_ids is None else self.X[self.rows(pr_ids)]
+        if columns is None or list(columns) == self.columns:
+            return X
+        return X[:, [self.columns.index(c) for c in columns]]
+
+    def to_frame(self):
+        frame = pd.DataFrame(self.X, columns=self.columns)
+        frame.insert(0, "pr_id", self.pr_ids)
+        if self.agents is not None:
+            frame.insert(1, "agent", self.agents)
+        if self.accepted is not None:
+            frame["accepted"] = self.accepted
+        return frame
+
+    # ---------- persistence (Arrow / Parquet) ----------
+    def to_arrow(self):
+        arrays = {"pr_id": pa.array(self.pr_ids)}
+        if self.agents is not None:
+            arrays["agent"] = pa.array(self.agents, type=pa.string())
+        if self.accepted is not None:
+            arrays["accepted"] = pa.array(self.accepted)
+        for j, name in enumerate(self.columns):
+            arrays[name] = pa.array(self.X[:, j])
+
+        table = pa.table(arrays)
+        return table.replace_schema_metadata({"feature_versions": json.dumps(self.versions)})
+
+    def save(self, path=FEATURE_STORE_PATH):
+        pq.write_table(self.to_arrow(), path)
+        return path
+
+    @classmethod
+    def load(cls, path=FEATURE_STORE_PATH, check_versions=True):
+        table = pq.read_table(path)
+        versions = json.loads(table.schema.metadata[b"feature_versions"])
+        if check_versions:
+            stale = {n: v for n, v in versions.items() if FEATURES.get(n, {}).get("version") != v}
+            if stale:
+                raise ValueError(f"feature store {path} has outdated feature definitions: {stale}")
+
+        columns = list(versions)
+        names = table.column_names
+        return cls(
+            table["pr_id"].to_numpy(),
+            np.column_stack([table[c].to_numpy() for c in columns]),
+            columns,
+            agents=table["agent"].to_numpy(zero_copy_only=False) if "agent" in names else None,
+            accepted=table["accepted"].to_numpy() if "accepted" in names else None,
+            versions=versions,
+        )
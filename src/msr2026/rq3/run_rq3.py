@@ -9,7 +9,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 from scipy.stats import mannwhitneyu
-from src.msr2026.utils.plotting import save_fig
+from src.msr2026.utils.layout import is_clustered, stream_pr_aggregate
+from src.msr2026.utils.plotting import save_fig, figure_fingerprint, skip_if_fresh
 
 
 
@@ -49,11 +50,11 @@ mpl.rcParams.update({
 # ============================================================
 # Data Loading
 # ============================================================
-def load_rq3_data():
+def load_rq3_data(data_root=DATA_ROOT, commits=True):
     print("Loading RQ3 data from HuggingFace...")
 
-    pull_request = pd.read_parquet(f"{DATA_ROOT}pull_request.parquet")
-    pr_commit_details = pd.read_parquet(f"{DATA_ROOT}pr_commit_details.parquet")
+    pull_request = pd.read_parquet(f"{data_root}pull_request.parquet")
+    pr_commit_details = pd.read_parquet(f"{data_root}pr_commit_details.parquet") if commits else None
 
     return pull_request, pr_commit_details
 
@@ -61,16 +62,8 @@ def load_rq3_data():
 # ============================================================
 # Feature Engineering
 # ============================================================
-def compute_features(pull_request, pr_commit_details):
-    print("Computing RQ3 features...")
-
-    ai_pr = pull_request[pull_request["agent"] != "Human"].copy()
-    ai_pr["pr_id"] = ai_pr["id"]
-    ai_pr["accepted"] = ai_pr["merged_at"].notna().astype(int)
-
-    # Description length
-    ai_pr["desc_length"] = ai_pr["body"].fillna("").astype(str).str.len()
-
+def aggregate_commit_features(pr_commit_details):
+    """Per-PR churn, files changed and test presence from commit file details."""
     # Churn & file count
     stats = (
         pr_commit_details.groupby("pr_id")
@@ -97,10 +90,37 @@ def compute_features(pull_request, pr_commit_details):
         .reset_index()
     )
 
-    final = (
-        ai_pr[["pr_id", "agent", "accepted", "desc_length"]]
-        .merge(stats[["pr_id", "churn", "files_changed"]], on="pr_id", how="left")
-        .merge(is_test, on="pr_id", how="left")
+    return stats[["pr_id", "churn", "files_changed"]].merge(is_test, on="pr_id", how="outer")
+
+
+def stream_commit_features(data_root):
+    """``aggregate_commit_features`` streamed over a pr_id-clustered pr_commit_details."""
+    print("Streaming commit features from pr_id-clustered commits...")
+    return stream_pr_aggregate(
+        data_root, "pr_commit_details", aggregate_commit_features,
+        columns=["additions", "deletions", "filename"],
+    )
+
+
+def compute_features(pull_request, pr_commit_details, commit_features=None):
+    """
+    RQ3 features of AI-authored PRs. ``commit_features`` (see
+    ``stream_commit_features``) replaces aggregating ``pr_commit_details``.
+    """
+    print("Computing RQ3 features...")
+
+    ai_pr = pull_request[pull_request["agent"] != "Human"].copy()
+    ai_pr["pr_id"] = ai_pr["id"]
+    ai_pr["accepted"] = ai_pr["merged_at"].notna().astype(int)
+
+    # Description length
+    ai_pr["desc_length"] = ai_pr["body"].fillna("").astype(str).str.len()
+
+    if commit_features is None:
+        commit_features = aggregate_commit_features(pr_commit_details)
+
+    final = ai_pr[["pr_id", "agent", "accepted", "desc_length"]].merge(
+        commit_features, on="pr_id", how="left"
     )
 
     final = final.fillna({"churn": 0, "files_changed": 0, "is_test": 0})
@@ -145,17 +165,40 @@ def log_box(ax, feature, title, final_clipped):
     ax.set_title(title, pad=10)
 
 
+def plot_feature_boxplots(final_clipped, plot_features, fname):
+    fingerprint = figure_fingerprint(
+        final_clipped[["accepted"] + [f for f, _ in plot_features]], plot_feature_boxplots, log_box,
+        features=plot_features, colors=[COLOR_ACCEPT, COLOR_REJECT],
+    )
+    if skip_if_fresh(FIG_DIR, fname, fingerprint):
+        return
+
+    fig, axes = plt.subplots(1, 3, figsize=(12, 4))
+    for ax, (f, title) in zip(axes, plot_features):
+        log_box(ax, f, title, final_clipped)
+
+    plt.tight_layout()
+    save_fig(FIG_DIR, fname, fingerprint)
+
+
 # ============================================================
 # MAIN ENTRYPOINT
 # ============================================================
-def run_rq3():
+def run_rq3(session=None, data_root=DATA_ROOT):
     print("\n===================== Running RQ3 =====================")
 
-    # 1. Load data
-    pull_request, pr_commit_details = load_rq3_data()
+    if session is None:
+        clustered = is_clustered(data_root, "pr_commit_details")
 
-    # 2. Compute features
-    final = compute_features(pull_request, pr_commit_details)
+        # 1. Load data
+        pull_request, pr_commit_details = load_rq3_data(data_root, commits=not clustered)
+
+        # 2. Compute features
+        commit_features = stream_commit_features(data_root) if clustered else None
+        final = compute_features(pull_request, pr_commit_details, commit_features)
+        del pull_request, pr_commit_details
+    else:
+        final = session["rq3_features"]
 
     # ---- Save raw features to CSV ----
     final.to_csv(f"{TABLE_DIR}/rq3_features_raw.csv", index=False)
@@ -185,17 +228,12 @@ def run_rq3():
     print("========================================================\n")
 
     # 5. Log-boxplots
-    fig, axes = plt.subplots(1, 3, figsize=(12, 4))
     plot_features = [
         ("desc_length", "Description Length"),
         ("churn", "Churn"),
         ("files_changed", "Files Changed"),
     ]
-    for ax, (f, title) in zip(axes, plot_features):
-        log_box(ax, f, title, final_clipped)
-
-    plt.tight_layout()
-    save_fig(FIG_DIR, "rq3_features")
+    plot_feature_boxplots(final_clipped, plot_features, "rq3_features")
 
     # 6. Statistical significance tests
     print("\n===== Statistical Significance Tests (RQ3) =====")
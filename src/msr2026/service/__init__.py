@@ -0,0 +1,3 @@
+from .metrics_service import MetricsStore, serve
+
+__all__ = ["MetricsStore", "serve"]
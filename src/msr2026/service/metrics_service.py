@@ -0,0 +1,351 @@
+# ============================================================
+# Local Metrics Query Service — keeps AIDev tables hot in memory
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ============================================================
+#
+# Usage:
+#   python -m src.msr2026.service.metrics_service --port 8765
+#
+#   GET /metrics                                   → available metrics
+#   GET /metrics/test_inclusion?agent=Devin&task_type=feat
+#   GET /metrics/resolution_rate?comment_type=security&since=2025-03-01
+#   GET /health                                    → row counts & cache stats
+
+import argparse
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from src.msr2026.rq1.run_rq1 import (
+    DATA_ROOT,
+    load_data,
+    extract_test_files,
+    merge_pr_info,
+)
+from src.msr2026.rq2.run_rq2 import load_rq2_data, build_classified_comments
+
+
+# ============================
+# Constants
+# ============================
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 256
+
+FILTERS = ("agent", "task_type", "since", "until", "comment_type")
+
+# metric name → (table, filters it accepts)
+METRICS = {
+    "test_inclusion": ("prs", ("agent", "task_type", "since", "until")),
+    "avg_test_files": ("prs", ("agent", "task_type", "since", "until")),
+    "conditional_test_files": ("prs", ("agent", "task_type", "since", "until")),
+    "comment_distribution": ("comments", FILTERS),
+    "resolution_rate": ("comments", FILTERS),
+}
+
+
+class QueryError(ValueError):
+    """Raised for malformed or unsupported metric queries (HTTP 400)."""
+
+
+# ============================
+# LRU Result Cache
+# ============================
+class LRUCache:
+    """Thread-safe least-recently-used cache for query results."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# ============================
+# In-memory Metrics Store
+# ============================
+def _to_utc(values):
+    return pd.to_datetime(values, errors="coerce", utc=True)
+
+
+def _index_by_time(df, time_col, categorical_cols):
+    """Sort by time (for binary-search windows) and make filter columns categorical."""
+    df = df.sort_values(time_col, kind="stable", na_position="first").reset_index(drop=True)
+    for col in categorical_cols:
+        df[col] = df[col].astype("category")
+    return df
+
+
+class MetricsStore:
+    """Loads the RQ1/RQ2 tables once and answers filtered metric queries."""
+
+    def __init__(self, data_root=DATA_ROOT, cache_size=DEFAULT_CACHE_SIZE):
+        self.cache = LRUCache(cache_size)
+        self.prs, self.comments = self._load(data_root)
+
+    # ---------- loading & indexing ----------
+    def _load(self, data_root):
+        print("Loading metrics service tables...")
+
+        all_pr, commit, task_type = load_data(data_root)
+        pr_df = merge_pr_info(all_pr, extract_test_files(commit), task_type)
+        del all_pr, commit
+        pr_df["created_at"] = _to_utc(pr_df["created_at"])
+
+        comments = build_classified_comments(*load_rq2_data(data_root))
+
+        # Comments inherit the task type of the PR they were left on
+        comments = comments.merge(
+            pr_df[["id", "task_type"]].rename(columns={"id": "pr_id"}),
+            on="pr_id",
+            how="left",
+        )
+        comments["task_type"] = comments["task_type"].fillna("Unknown")
+        comments["comment_time"] = _to_utc(comments["comment_time"])
+        comments = comments[["pr_id", "agent", "task_type", "comment_type", "comment_time", "resolved"]]
+
+        prs = _index_by_time(pr_df, "created_at", ["agent", "task_type"])
+        comments = _index_by_time(comments, "comment_time", ["agent", "task_type", "comment_type"])
+
+        print(f"✔ Indexed {len(prs):,} PRs and {len(comments):,} classified comments")
+        return prs, comments
+
+    # ---------- filtering ----------
+    @staticmethod
+    def _time_slice(df, time_col, since, until):
+        if since is None and until is None:
+            return df
+
+        # Rows without a timestamp sort first and never fall inside a window
+        n_missing = int(df[time_col].isna().sum())
+        times = df[time_col].iloc[n_missing:]
+        start = times.searchsorted(since, side="left") if since is not None else 0
+        stop = times.searchsorted(until, side="right") if until is not None else len(times)
+        return df.iloc[n_missing + start:n_missing + stop]
+
+    def _select(self, table, filters):
+        df = self.prs if table == "prs" else self.comments
+        time_col = "created_at" if table == "prs" else "comment_time"
+
+        df = self._time_slice(df, time_col, filters.get("since"), filters.get("until"))
+
+        mask = None
+        for col in ("agent", "task_type", "comment_type"):
+            values = filters.get(col)
+            if values is None:
+                continue
+            col_mask = df[col].isin(values).to_numpy()
+            mask = col_mask if mask is None else mask & col_mask
+
+        return df if mask is None else df[mask]
+
+    # ---------- query API ----------
+    def query(self, metric, **filters):
+        """Return a JSON-serializable result for ``metric`` under ``filters``."""
+        if metric not in METRICS:
+            raise QueryError(f"unknown metric '{metric}'")
+        table, allowed = METRICS[metric]
+
+        filters = {k: v for k, v in filters.items() if v not in (None, "", [], ())}
+        unsupported = sorted(set(filters) - set(allowed))
+        if unsupported:
+            raise QueryError(f"metric '{metric}' does not support filter(s): {', '.join(unsupported)}")
+
+        normalized = _normalize_filters(filters)
+        key = (metric, tuple(sorted((k, _cache_token(v)) for k, v in normalized.items())))
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            # Callers get their own copy; compute_ms is that of the original computation
+            return {**copy.deepcopy(cached), "cached": True}
+
+        start = time.perf_counter()
+        df = self._select(table, normalized)
+        rows = getattr(self, f"_metric_{metric}")(df)
+        result = {
+            "metric": metric,
+            "filters": {k: _cache_token(v) for k, v in normalized.items()},
+            "n": int(len(df)),
+            "rows": rows,
+            "compute_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+        self.cache.put(key, result)
+        return {**copy.deepcopy(result), "cached": False}
+
+    # ---------- metrics (mirror RQ1 / RQ2 definitions) ----------
+    @staticmethod
+    def _by_agent(series, name):
+        return [
+            {"agent": agent, name: float(value)}
+            for agent, value in series.items()
+            if pd.notna(value)
+        ]
+
+    def _metric_test_inclusion(self, df):
+        rates = df.groupby("agent", observed=True)["contains_test"].mean()
+        return self._by_agent(rates, "test_inclusion_rate")
+
+    def _metric_avg_test_files(self, df):
+        avg = df.groupby("agent", observed=True)["test_file_count"].mean()
+        return self._by_agent(avg, "avg_test_file_count")
+
+    def _metric_conditional_test_files(self, df):
+        cond = (
+            df[df["test_file_count"] > 0]
+            .groupby("agent", observed=True)["test_file_count"]
+            .mean()
+        )
+        return self._by_agent(cond, "conditional_avg_test_file_count")
+
+    def _metric_comment_distribution(self, df):
+        df = df[df["comment_type"] != "other"]
+        counts = df.groupby(["agent", "comment_type"], observed=True).size()
+        totals = counts.groupby(level="agent", observed=True).transform("sum")
+        return [
+            {"agent": agent, "comment_type": ctype, "count": int(n), "share": float(n / total)}
+            for (agent, ctype), n, total in zip(counts.index, counts.values, totals.values)
+        ]
+
+    def _metric_resolution_rate(self, df):
+        grouped = df.groupby(["agent", "comment_type"], observed=True)["resolved"]
+        stats = pd.DataFrame({"count": grouped.size(), "rate": grouped.mean()})
+        return [
+            {"agent": agent, "comment_type": ctype, "count": int(row["count"]), "resolution_rate": float(row["rate"])}
+            for (agent, ctype), row in stats.iterrows()
+        ]
+
+    def health(self):
+        return {
+            "prs": int(len(self.prs)),
+            "comments": int(len(self.comments)),
+            "cache": self.cache.stats(),
+        }
+
+
+def _normalize_filters(filters):
+    """Turn raw filter values into sorted value lists and UTC timestamps."""
+    normalized = {}
+    for key, value in filters.items():
+        if key in ("since", "until"):
+            try:
+                ts = pd.Timestamp(value)
+            except (TypeError, ValueError) as exc:
+                raise QueryError(f"invalid timestamp for '{key}': {value}") from exc
+            normalized[key] = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+        else:
+            if isinstance(value, str):
+                value = value.split(",")
+            normalized[key] = sorted({str(v).strip() for v in value if str(v).strip()})
+    return normalized
+
+
+def _cache_token(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return tuple(value)
+
+
+# ============================
+# HTTP / JSON Interface
+# ============================
+def make_handler(store):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+
+            if parts == ["health"]:
+                return self._send(200, store.health())
+            if parts == ["metrics"]:
+                return self._send(200, {m: list(f) for m, (_, f) in METRICS.items()})
+            if len(parts) != 2 or parts[0] != "metrics":
+                return self._send(404, {"error": f"no route for {url.path}"})
+
+            params = parse_qs(url.query)
+            unknown = sorted(set(params) - set(FILTERS))
+            if unknown:
+                return self._send(400, {"error": f"unknown filter(s): {', '.join(unknown)}"})
+            filters = {k: ",".join(v) for k, v in params.items()}
+
+            try:
+                return self._send(200, store.query(parts[1], **filters))
+            except QueryError as exc:
+                return self._send(400, {"error": str(exc)})
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return MetricsHandler
+
+
+def serve(store, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Serve ``store`` over HTTP until interrupted."""
+    server = ThreadingHTTPServer((host, port), make_handler(store))
+    print(f"✔ Metrics service listening on http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ============================
+# MAIN ENTRYPOINT
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve AIDev RQ metrics over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data-root", default=DATA_ROOT,
+                        help="Dataset root (hf:// URL or local mirror directory ending in '/').")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="Maximum number of cached query results (LRU eviction).")
+    args = parser.parse_args(argv)
+
+    store = MetricsStore(data_root=args.data_root, cache_size=args.cache_size)
+    serve(store, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
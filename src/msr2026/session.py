@@ -0,0 +1,254 @@
+# ============================================================
+# AIDevSession — shared, memory-budgeted handle on AIDev tables
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ============================================================
+#
+# Tables and derived frames are loaded lazily on first access and memoized.
+# When the in-memory footprint exceeds the RAM budget, least-recently-used
+# entries are spilled to a local cache directory and reloaded from there
+# (not from the network) on the next access.
+#
+# Usage:
+#   session = AIDevSession(memory_budget="4GB")
+#   run_rq1(session=session); run_rq2(session=session); run_rq3(session=session)
+#
+#   # Raw tables read from files downloaded in the background
+#   session = AIDevSession(prefetcher=Prefetcher().start())
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.msr2026.rq1.run_rq1 import DATA_ROOT, extract_test_files, merge_pr_info, stream_test_files
+from src.msr2026.rq2.run_rq2 import select_rq2_columns, build_classified_comments, indexed_commit_counts
+from src.msr2026.rq3.run_rq3 import compute_features, stream_commit_features
+from src.msr2026.utils.layout import is_clustered
+
+
+# ============================
+# Constants
+# ============================
+CACHE_DIR = "../data/session_cache/"
+
+RAW_TABLES = (
+    "all_pull_request",
+    "pull_request",
+    "pr_task_type",
+    "pr_commit_details",
+    "pr_commits",
+    "pr_reviews",
+    "pr_review_comments_v2",
+)
+
+_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+def parse_memory_budget(budget):
+    """Accept bytes (int) or a size string such as ``"512MB"`` / ``"4GB"``."""
+    if budget is None or isinstance(budget, (int, float)):
+        return budget
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?B?)\s*", str(budget).upper())
+    if not match:
+        raise ValueError(f"invalid memory budget: {budget!r}")
+    value, unit = match.groups()
+    unit = unit if unit.endswith("B") or not unit else unit + "B"
+    return int(float(value) * _UNITS[unit])
+
+
+def frame_nbytes(df):
+    """In-memory footprint of a DataFrame, including Python string payloads."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+# ============================
+# Derived Frames
+# ============================
+def _streamable(session, table):
+    """True if ``table`` is unloaded and pr_id-clustered (prefetched copies have no indexes)."""
+    return (
+        session.prefetcher is None
+        and table not in session
+        and is_clustered(session.data_root, table)
+    )
+
+
+def _rq1_pr(session):
+    if _streamable(session, "pr_commit_details"):
+        pr_test = stream_test_files(session.data_root)
+    else:
+        commit = session["pr_commit_details"][["pr_id", "filename"]].copy()
+        pr_test = extract_test_files(commit)
+    return merge_pr_info(session["all_pull_request"], pr_test, session["pr_task_type"])
+
+
+def _rq2_comments(session):
+    indexed = _streamable(session, "pr_commits")
+    all_pr, pr_reviews, pr_commits = select_rq2_columns(
+        session["all_pull_request"], session["pr_reviews"], None if indexed else session["pr_commits"]
+    )
+    return build_classified_comments(
+        session["pr_review_comments_v2"], all_pr, pr_reviews, pr_commits, workers=session.workers,
+        commit_count=indexed_commit_counts(session.data_root) if indexed else None,
+    )
+
+
+def _rq3_features(session):
+    if _streamable(session, "pr_commit_details"):
+        return compute_features(session["pull_request"], None, stream_commit_features(session.data_root))
+    return compute_features(session["pull_request"], session["pr_commit_details"])
+
+
+DERIVED_FRAMES = {
+    "rq1_pr": _rq1_pr,
+    "rq2_comments": _rq2_comments,
+    "rq3_features": _rq3_features,
+}
+
+
+# ============================
+# Session
+# ============================
+class AIDevSession:
+    """
+    Lazily loaded, memoized AIDev tables under an optional RAM budget.
+
+    ``session[name]`` returns a raw table (e.g. ``"pr_commits"``) or a derived
+    frame (``"rq1_pr"``, ``"rq2_comments"``, ``"rq3_features"``). Returned frames
+    are shared between callers and must be treated as read-only.
+
+    With a started ``Prefetcher``, raw tables are read from its local copies,
+    waiting only for the file being loaded.
+    """
+
+    def __init__(self, data_root=DATA_ROOT, memory_budget=None, cache_dir=CACHE_DIR, workers=1,
+                 prefetcher=None):
+        if prefetcher is not None:
+            data_root = prefetcher.data_root
+        self.data_root = data_root
+        self.prefetcher = prefetcher
+        self.memory_budget = parse_memory_budget(memory_budget)
+        self.workers = workers  # processes for RQ2 comment text processing
+
+        # Spill files live in a private directory per session (created on first spill)
+        self._cache_root = cache_dir
+        self._cache_prefix = hashlib.sha1(data_root.encode("utf-8")).hexdigest()[:12] + "-"
+        self.cache_dir = None
+
+        self._loaders = {name: self._raw_loader(name) for name in RAW_TABLES}
+        self._loaders.update(DERIVED_FRAMES)
+
+        self._frames = OrderedDict()  # name → (DataFrame, nbytes), LRU order
+        self._spilled = set()
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "loads": 0, "reloads": 0, "evictions": 0}
+
+    # ---------- registration ----------
+    def _raw_loader(self, name):
+        def load(session):
+            if session.prefetcher is not None and name in session.prefetcher.files:
+                return pd.read_parquet(session.prefetcher.wait(name))
+            return pd.read_parquet(f"{session.data_root}{name}.parquet")
+        return load
+
+    def register(self, name, loader):
+        """Register a derived frame computed as ``loader(session)``."""
+        with self._lock:
+            self._loaders[name] = loader
+            self.drop(name)
+
+    # ---------- access ----------
+    def __getitem__(self, name):
+        with self._lock:
+            if name in self._frames:
+                self._frames.move_to_end(name)
+                self.stats["hits"] += 1
+                return self._frames[name][0]
+
+            if name not in self._loaders:
+                raise KeyError(f"unknown AIDev table or frame: {name!r}")
+
+            if name in self._spilled:
+                df = pd.read_pickle(self._spill_path(name))
+                self.stats["reloads"] += 1
+            else:
+                print(f"[session] loading {name}...")
+                df = self._loaders[name](self)
+                self.stats["loads"] += 1
+
+            self._frames[name] = (df, frame_nbytes(df))
+            self._enforce_budget(keep=name)
+            return df
+
+    def __contains__(self, name):
+        return name in self._frames
+
+    def drop(self, name):
+        """Forget a memoized frame entirely (memory and spill file)."""
+        with self._lock:
+            self._frames.pop(name, None)
+            if name in self._spilled:
+                self._spilled.discard(name)
+                os.remove(self._spill_path(name))
+
+    def release(self, keep=()):
+        """
+        Free every in-memory frame not in ``keep`` (e.g. once an RQ is done).
+        Under a memory budget raw tables are spilled, so a later RQ reloads them
+        from local disk; otherwise frames are dropped, as if each RQ loaded its own.
+        """
+        with self._lock:
+            for name in [n for n in self._frames if n not in keep]:
+                if self.memory_budget is not None and name in RAW_TABLES:
+                    self._evict(name)
+                else:
+                    self.drop(name)
+
+    # ---------- memory accounting ----------
+    @property
+    def memory_usage(self):
+        return sum(nbytes for _, nbytes in self._frames.values())
+
+    def summary(self):
+        """Per-frame memory footprint (MB) in least- to most-recently-used order."""
+        return pd.DataFrame(
+            [(name, nbytes / 1024 ** 2) for name, (_, nbytes) in self._frames.items()],
+            columns=["frame", "memory_mb"],
+        )
+
+    def _spill_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+
+    def _evict(self, name):
+        df, _ = self._frames.pop(name)
+        if name not in self._spilled:
+            if self.cache_dir is None:
+                os.makedirs(self._cache_root, exist_ok=True)
+                self.cache_dir = tempfile.mkdtemp(prefix=self._cache_prefix, dir=self._cache_root)
+            df.to_pickle(self._spill_path(name))
+            self._spilled.add(name)
+        self.stats["evictions"] += 1
+        print(f"[session] evicted {name} (budget {self.memory_budget / 1024 ** 2:,.0f} MB)")
+
+    def _enforce_budget(self, keep):
+        if self.memory_budget is None:
+            return
+        for name in list(self._frames):
+            if self.memory_usage <= self.memory_budget:
+                break
+            if name != keep:
+                self._evict(name)
+
+    def clear(self):
+        """Drop all in-memory frames and remove this session's spill directory."""
+        with self._lock:
+            for name in list(self._frames) + list(self._spilled):
+                self.drop(name)
+            if self.cache_dir is not None:
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+                self.cache_dir = None
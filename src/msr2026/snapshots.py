@@ -0,0 +1,266 @@
+# ============================================================
+# Multi-Snapshot Comparison — RQ1–RQ3 metric drift across AIDev revisions
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ============================================================
+#
+# Usage:
+#   python -m src.msr2026.snapshots --revisions v1.0 v1.1 main
+#   python -m src.msr2026.snapshots --roots /mirrors/aidev_2025_06/ /mirrors/aidev_2025_09/
+#
+# Each snapshot is materialized into a content-addressed local cache (files
+# unchanged between snapshots are fetched once), RQ tables are computed for
+# all snapshots in parallel (per-RQ results are memoized by input and code
+# fingerprint), and a per-agent diff table against the first snapshot is written.
+
+import argparse
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.msr2026.rq1.run_rq1 import (
+    TEST_PATTERN,
+    aggregate_test_files,
+    compute_agent_metrics,
+    extract_test_files,
+    merge_pr_info,
+    stream_test_files,
+)
+from src.msr2026.rq2.parallel_text import clean_and_classify_parallel
+from src.msr2026.rq2.run_rq2 import (
+    COMMENT_RULES,
+    apply_comment_rules,
+    attach_resolution,
+    build_classified_comments,
+    classify_comments,
+    clean_comments,
+    compute_resolution_matrix,
+    compute_type_distribution,
+    count_commits,
+    indexed_commit_counts,
+    merge_review_metadata,
+    select_rq2_columns,
+    stage1_mask,
+    stage2_mask,
+)
+from src.msr2026.rq3.run_rq3 import aggregate_commit_features, compute_features, stream_commit_features
+from src.msr2026.session import DERIVED_FRAMES, AIDevSession
+from src.msr2026.utils.cache import CACHE_DIR, RQ_FILES, all_files, code_fingerprint, materialize
+
+
+# ============================
+# Constants
+# ============================
+HF_DATASET = "hf://datasets/hao-li/AIDev"
+TABLE_DIR = "../output/tables/snapshots"
+
+# Bump to invalidate memoized results for reasons the code fingerprints below
+# cannot see (e.g. a pandas upgrade changing results)
+METRICS_VERSION = 1
+
+
+def revision_root(revision):
+    """Dataset root of a HuggingFace revision (branch, tag or commit)."""
+    return f"{HF_DATASET}@{revision}/"
+
+
+def snapshot_label(data_root):
+    root = data_root.rstrip("/\\")
+    if "@" in root:
+        return root.rsplit("@", 1)[1]
+    return os.path.basename(root) or root
+
+
+# ============================
+# Per-Agent Metrics (long format: rq, metric, agent, value)
+# ============================
+def _melt(frame, rq, prefix=""):
+    frame = frame.copy()
+    frame.index.name = "agent"
+    long = frame.reset_index().melt(id_vars="agent", var_name="metric", value_name="value")
+    long["metric"] = prefix + long["metric"].astype(str)
+    long["rq"] = rq
+    return long[["rq", "metric", "agent", "value"]]
+
+
+def rq1_metrics(session):
+    inclusion, avg_test, conditional = compute_agent_metrics(session["rq1_pr"])
+    behavior_matrix = (
+        inclusion.set_index("agent")
+        .join(avg_test.set_index("agent"))
+        .join(conditional.set_index("agent"))
+    )
+    return _melt(behavior_matrix, "rq1")
+
+
+def rq2_metrics(session):
+    classified = session["rq2_comments"]
+    _, _, type_counts_pct = compute_type_distribution(classified)
+    correction_stats = compute_resolution_matrix(classified)
+    return pd.concat([
+        _melt(type_counts_pct, "rq2", "comment_share:"),
+        _melt(correction_stats, "rq2", "resolution_rate:"),
+    ], ignore_index=True)
+
+
+def rq3_metrics(session):
+    final = session["rq3_features"]
+    summary = final.groupby("agent").agg(
+        acceptance_rate=("accepted", "mean"),
+        desc_length_median=("desc_length", "median"),
+        churn_median=("churn", "median"),
+        files_changed_median=("files_changed", "median"),
+        test_share=("is_test", "mean"),
+    )
+    return _melt(summary, "rq3")
+
+
+RQ_METRICS = {"rq1": rq1_metrics, "rq2": rq2_metrics, "rq3": rq3_metrics}
+
+# Code and constants each RQ's metrics are derived from
+RQ_CODE = {
+    "rq1": (
+        TEST_PATTERN, extract_test_files, aggregate_test_files, stream_test_files,
+        merge_pr_info, compute_agent_metrics, DERIVED_FRAMES["rq1_pr"], rq1_metrics,
+    ),
+    "rq2": (
+        select_rq2_columns, merge_review_metadata, stage1_mask, stage2_mask, clean_comments,
+        COMMENT_RULES, classify_comments, apply_comment_rules, count_commits,
+        indexed_commit_counts, attach_resolution,
+        build_classified_comments, clean_and_classify_parallel, compute_type_distribution,
+        compute_resolution_matrix, DERIVED_FRAMES["rq2_comments"], rq2_metrics,
+    ),
+    "rq3": (
+        aggregate_commit_features, stream_commit_features, compute_features,
+        DERIVED_FRAMES["rq3_features"], rq3_metrics,
+    ),
+}
+RQ_CODE_FINGERPRINTS = {rq: code_fingerprint(*objects) for rq, objects in RQ_CODE.items()}
+
+
+def result_key(rq, fingerprints):
+    """Memoization key: metric version, RQ code, and content of every file the RQ reads."""
+    parts = [rq, str(METRICS_VERSION), RQ_CODE_FINGERPRINTS[rq]]
+    parts += [fingerprints[name] for name in RQ_FILES[rq]]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:24]
+
+
+def _result_path(cache_dir, key):
+    return os.path.join(cache_dir, "results", f"{key}.pkl")
+
+
+def compute_snapshot(view_root, result_paths, workers=1):
+    """Compute and store the missing per-RQ results of one materialized snapshot."""
+    session = AIDevSession(data_root=view_root, workers=workers)
+    written = []
+
+    for rq, path in result_paths.items():
+        if os.path.exists(path):
+            continue
+
+        metrics = RQ_METRICS[rq](session)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        metrics.to_pickle(tmp)
+        os.replace(tmp, path)
+        written.append(path)
+
+    session.clear()
+    return written
+
+
+# ============================
+# Diff Table
+# ============================
+def diff_snapshots(metrics, labels):
+    """Wide table of metric values per snapshot plus deltas vs. the first snapshot."""
+    wide = (
+        metrics.pivot_table(index=["rq", "metric", "agent"], columns="snapshot",
+                            values="value", aggfunc="first")
+        .reindex(columns=labels)
+    )
+    base = labels[0]
+    for label in labels[1:]:
+        wide[f"delta_{label}"] = wide[label] - wide[base]
+    wide.columns.name = None
+    return wide.reset_index()
+
+
+def compare_snapshots(roots, labels=None, cache_dir=CACHE_DIR, processes=None,
+                      rqs=tuple(RQ_METRICS), table_dir=TABLE_DIR):
+    """Compute RQ1–RQ3 per-agent metrics for every root and diff them."""
+    labels = list(labels or [snapshot_label(r) for r in roots])
+    if len(set(labels)) != len(labels):
+        raise ValueError(f"snapshot labels must be unique: {labels}")
+
+    files = all_files(rqs)
+
+    # Materialize serially: shared files are fetched once, then hit the object store
+    jobs = []
+    for root, label in zip(roots, labels):
+        print(f"Materializing snapshot '{label}' from {root}...")
+        view_root, fingerprints = materialize(root, cache_dir, files)
+        result_paths = {rq: _result_path(cache_dir, result_key(rq, fingerprints)) for rq in rqs}
+        jobs.append((label, view_root, result_paths))
+
+    # Snapshots whose inputs to an RQ are identical share its result key: each
+    # missing result is computed once, by the first snapshot that needs it
+    tasks = {}
+    pending = set()
+    for _, view_root, result_paths in jobs:
+        for rq, path in result_paths.items():
+            if path not in pending and not os.path.exists(path):
+                pending.add(path)
+                tasks.setdefault(view_root, {})[rq] = path
+
+    if tasks:
+        processes = processes or min(len(tasks), os.cpu_count() or 1)
+        print(f"Computing {len(pending)} RQ tables for {len(jobs)} snapshots ({processes} processes)...")
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for future in [pool.submit(compute_snapshot, view_root, paths) for view_root, paths in tasks.items()]:
+                future.result()
+    else:
+        print(f"All RQ tables for {len(jobs)} snapshots are memoized.")
+
+    metrics = pd.concat(
+        [pd.read_pickle(path).assign(snapshot=label)
+         for label, _, result_paths in jobs for path in result_paths.values()],
+        ignore_index=True,
+    )
+
+    diff = diff_snapshots(metrics, labels)
+
+    os.makedirs(table_dir, exist_ok=True)
+    metrics.to_csv(f"{table_dir}/snapshot_metrics_long.csv", index=False)
+    diff.to_csv(f"{table_dir}/snapshot_diff.csv", index=False)
+    print("✔ Snapshot comparison tables saved to:", table_dir)
+
+    return diff
+
+
+# ============================
+# MAIN ENTRYPOINT
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare RQ1–RQ3 metrics across AIDev snapshots.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--roots", nargs="+", help="Dataset roots (local mirrors or URLs ending in '/').")
+    group.add_argument("--revisions", nargs="+", help="HuggingFace revisions of hao-li/AIDev.")
+    parser.add_argument("--labels", nargs="+", help="Snapshot labels (default: derived from roots).")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    roots = args.roots or [revision_root(rev) for rev in args.revisions]
+    roots = [r if r.endswith(("/", "\\")) else r + "/" for r in roots]
+    if len(roots) < 2:
+        parser.error("at least two snapshots are needed for a comparison")
+    if args.labels and len(args.labels) != len(roots):
+        parser.error("--labels must match the number of snapshots")
+
+    compare_snapshots(roots, labels=args.labels, cache_dir=args.cache_dir, processes=args.processes)
+
+
+if __name__ == "__main__":
+    main()
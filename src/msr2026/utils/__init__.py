@@ -1,4 +1,4 @@
 from .plotting import save_fig
+from .layout import cluster_by_pr_id, read_pr_rows, stream_pr_aggregate
 
-__all__ = ["save_fig"]
-
+__all__ = ["save_fig", "cluster_by_pr_id", "read_pr_rows", "stream_pr_aggregate"]
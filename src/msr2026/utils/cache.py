@@ -0,0 +1,156 @@
+# ============================================================
+# Content-addressed Local Cache for AIDev Dataset Files
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ============================================================
+#
+# Each dataset file is stored once under ``<cache>/objects/<fingerprint>.parquet``.
+# A dataset root (hf:// revision, local mirror, ...) is materialized as a
+# directory of links into the object store, so files that are unchanged
+# between snapshots are fetched and stored only once.
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import fsspec
+
+
+# ============================
+# Constants
+# ============================
+CACHE_DIR = "../data/aidev_cache/"
+
+# Dataset files read by each RQ pipeline
+RQ_FILES = {
+    "rq1": ("all_pull_request", "pr_commit_details", "pr_task_type"),
+    "rq2": ("pr_review_comments_v2", "all_pull_request", "pr_reviews", "pr_commits"),
+    "rq3": ("pull_request", "pr_commit_details"),
+}
+
+_HASH_BLOCK = 1 << 20
+
+
+def all_files(rqs=tuple(RQ_FILES)):
+    """Distinct dataset files needed by ``rqs``, in first-use order."""
+    return tuple(dict.fromkeys(name for rq in rqs for name in RQ_FILES[rq]))
+
+
+def root_key(data_root):
+    return hashlib.sha1(data_root.encode("utf-8")).hexdigest()[:12]
+
+
+# ============================
+# Fingerprints
+# ============================
+def file_fingerprint(url):
+    """
+    Content fingerprint of a dataset file: the LFS sha256 / git blob id on
+    HuggingFace, a sha256 of the bytes for local files, else ETag or size+mtime.
+    """
+    fs, path = fsspec.core.url_to_fs(url)
+    info = fs.info(path)
+
+    lfs = info.get("lfs") or {}
+    if lfs.get("sha256"):
+        return lfs["sha256"]
+    if info.get("blob_id"):
+        return info["blob_id"]
+
+    if "file" in fs.protocol:
+        digest = hashlib.sha256()
+        with fs.open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    token = info.get("ETag") or info.get("etag") or f"{url}:{info.get('size')}:{info.get('mtime')}"
+    return hashlib.sha256(str(token).encode("utf-8")).hexdigest()
+
+
+def hash_code(h, code):
+    """Feed a code object (bytecode, referenced names, constants, nested code) into ``h``."""
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            # repr() of a code object contains its address: hash its contents instead
+            hash_code(h, const)
+        else:
+            h.update(repr(const).encode("utf-8"))
+
+
+def code_fingerprint(*objects):
+    """
+    Fingerprint of the code behind a result: functions (code and default
+    arguments) and plain constants such as regex patterns or rule tables.
+    """
+    h = hashlib.sha256()
+    for obj in objects:
+        code = getattr(obj, "__code__", None)
+        if code is not None:
+            hash_code(h, code)
+            h.update(repr((obj.__defaults__, obj.__kwdefaults__)).encode("utf-8"))
+        else:
+            h.update(json.dumps(obj, sort_keys=True, default=repr).encode("utf-8"))
+    return h.hexdigest()
+
+
+# ============================
+# Object Store
+# ============================
+def object_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, "objects", f"{fingerprint}.parquet")
+
+
+def fetch_object(url, cache_dir, fingerprint):
+    """Copy ``url`` into the object store unless its content is already cached."""
+    dst = object_path(cache_dir, fingerprint)
+    if os.path.exists(dst):
+        return dst
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with fsspec.open(url, "rb") as src, open(tmp, "wb") as out:
+        shutil.copyfileobj(src, out, length=_HASH_BLOCK)
+    os.replace(tmp, dst)
+    return dst
+
+
+def _link(src, dst):
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.symlink(os.path.abspath(src), dst)
+    except OSError:
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+
+def materialize(data_root, cache_dir=CACHE_DIR, files=None, workers=4):
+    """
+    Make ``files`` of ``data_root`` available locally.
+
+    Returns ``(view_root, fingerprints)``: a local directory usable as a
+    ``data_root`` and the fingerprint of every file in it.
+    """
+    files = files or all_files()
+    view_root = os.path.join(cache_dir, "snapshots", root_key(data_root)) + os.sep
+    os.makedirs(view_root, exist_ok=True)
+
+    urls = {name: f"{data_root}{name}.parquet" for name in files}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fingerprints = dict(zip(files, pool.map(file_fingerprint, urls.values())))
+        objects = list(pool.map(
+            lambda name: fetch_object(urls[name], cache_dir, fingerprints[name]), files
+        ))
+
+    for name, obj in zip(files, objects):
+        _link(obj, f"{view_root}{name}.parquet")
+
+    return view_root, fingerprints
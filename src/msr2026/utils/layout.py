@@ -0,0 +1,253 @@
+# ============================================================
+# pr_id-Clustered Parquet Layout for AIDev Commit & Comment Tables
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ============================================================
+#
+# Rewrites the per-PR tables sorted by ``pr_id`` with row-group min/max
+# statistics and a sidecar ``<table>.pr_index.parquet`` (pr_id → [start, stop)
+# row range). The output directory is a drop-in ``data_root`` for the RQ
+# loaders; the remaining tables are copied unchanged.
+#
+# Usage:
+#   python -m src.msr2026.utils.layout --src hf://datasets/hao-li/AIDev/ \
+#       --dst ../data/AIDev_clustered/
+
+import argparse
+import os
+import shutil
+from functools import lru_cache
+
+import fsspec
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# ============================
+# Constants
+# ============================
+DATA_ROOT = "hf://datasets/hao-li/AIDev/"
+CLUSTERED_ROOT = "../data/AIDev_clustered/"
+
+CLUSTERED_TABLES = (
+    "pr_commit_details",
+    "pr_commits",
+    "pr_reviews",
+    "pr_review_comments_v2",
+)
+COPIED_TABLES = (
+    "all_pull_request",
+    "pull_request",
+    "pr_task_type",
+)
+
+DEFAULT_ROW_GROUP_SIZE = 64_000
+INDEX_SUFFIX = ".pr_index.parquet"
+
+
+def table_path(root, table):
+    return f"{root}{table}.parquet"
+
+
+def index_path(root, table):
+    return f"{root}{table}{INDEX_SUFFIX}"
+
+
+# ============================
+# Preprocessing
+# ============================
+def _attach_pr_id(comments, pr_reviews):
+    """Review comments only reference their review; resolve the owning PR."""
+    mapping = pr_reviews[["id", "pr_id"]].rename(columns={"id": "pull_request_review_id"})
+    mapping["pr_id"] = mapping["pr_id"].astype("Int64")
+    return comments.merge(mapping, on="pull_request_review_id", how="left")
+
+
+def build_pr_index(pr_ids):
+    """Compute pr_id → [start, stop) row ranges over a pr_id-sorted column."""
+    pr_ids = pd.Series(pr_ids)
+    valid = pr_ids.notna().to_numpy()
+    values = pr_ids[valid].to_numpy(dtype="int64")
+
+    if len(values) == 0:
+        return pd.DataFrame({"pr_id": [], "start": [], "stop": []}, dtype="int64")
+
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    stops = np.r_[starts[1:], len(values)]
+
+    # Nulls are sorted last, so valid rows occupy the leading positions
+    return pd.DataFrame({"pr_id": values[starts], "start": starts, "stop": stops})
+
+
+def write_clustered_table(df, dst_root, table, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Sort ``df`` by pr_id and write it plus its sidecar row-range index."""
+    df = df.sort_values("pr_id", kind="stable", na_position="last").reset_index(drop=True)
+
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False),
+        table_path(dst_root, table),
+        row_group_size=row_group_size,
+        write_statistics=True,
+    )
+    index = build_pr_index(df["pr_id"])
+    index.to_parquet(index_path(dst_root, table), index=False)
+
+    print(f"✔ {table}: {len(df):,} rows, {len(index):,} PRs")
+    return index
+
+
+def cluster_by_pr_id(src_root=DATA_ROOT, dst_root=CLUSTERED_ROOT,
+                     tables=CLUSTERED_TABLES, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Rewrite the per-PR tables of ``src_root`` into a pr_id-clustered ``dst_root``."""
+    print(f"Clustering AIDev tables by pr_id → {dst_root}")
+    os.makedirs(dst_root, exist_ok=True)
+
+    pr_reviews = None
+    if "pr_review_comments_v2" in tables:
+        pr_reviews = pd.read_parquet(table_path(src_root, "pr_reviews"))
+
+    for table in tables:
+        if table == "pr_reviews" and pr_reviews is not None:
+            df = pr_reviews
+        else:
+            df = pd.read_parquet(table_path(src_root, table))
+
+        if table == "pr_review_comments_v2" and "pr_id" not in df.columns:
+            df = _attach_pr_id(df, pr_reviews)
+
+        write_clustered_table(df, dst_root, table, row_group_size)
+        del df
+
+    for table in COPIED_TABLES:
+        with fsspec.open(table_path(src_root, table), "rb") as src, \
+                open(table_path(dst_root, table), "wb") as dst:
+            shutil.copyfileobj(src, dst, length=1 << 20)
+        print(f"✔ {table}: copied")
+
+    load_pr_index.cache_clear()
+    return dst_root
+
+
+# ============================
+# Range Reads
+# ============================
+def is_clustered(root, table):
+    fs, path = fsspec.core.url_to_fs(index_path(root, table))
+    return fs.exists(path)
+
+
+@lru_cache(maxsize=None)
+def load_pr_index(root, table):
+    """Load (and memoize) the sidecar pr_id → row-range index of ``table``."""
+    return pd.read_parquet(index_path(root, table))
+
+
+def _row_group_bounds(parquet_file):
+    sizes = [parquet_file.metadata.row_group(i).num_rows
+             for i in range(parquet_file.metadata.num_row_groups)]
+    return np.cumsum([0] + sizes)
+
+
+def _empty_frame(root, table, columns=None):
+    with fsspec.open(table_path(root, table), "rb") as f:
+        schema = pq.read_schema(f)
+    names = columns if columns is not None else schema.names
+    return schema.empty_table().select(names).to_pandas()
+
+
+def read_rows(root, table, start, stop, columns=None):
+    """Read rows [start, stop) of ``table`` touching only the overlapping row groups."""
+    with fsspec.open(table_path(root, table), "rb") as f:
+        pf = pq.ParquetFile(f)
+        bounds = _row_group_bounds(pf)
+
+        first = int(np.searchsorted(bounds, start, side="right") - 1)
+        last = int(np.searchsorted(bounds, stop, side="left"))
+        groups = list(range(first, max(first + 1, last)))
+
+        data = pf.read_row_groups(groups, columns=columns)
+        offset = start - bounds[first]
+        return data.slice(offset, stop - start).to_pandas()
+
+
+def read_pr_rows(root, table, pr_id, columns=None):
+    """Fetch all rows of one PR from a clustered table via its sidecar index."""
+    index = load_pr_index(root, table)
+    pos = int(np.searchsorted(index["pr_id"].to_numpy(), pr_id))
+
+    if pos == len(index) or index["pr_id"].iat[pos] != pr_id:
+        return _empty_frame(root, table, columns)
+
+    return read_rows(root, table, int(index["start"].iat[pos]), int(index["stop"].iat[pos]), columns)
+
+
+# ============================
+# Streaming Per-PR Aggregation
+# ============================
+def iter_pr_chunks(root, table, columns=None, batch_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Stream a clustered table as DataFrames that never split a PR across chunks.
+    Rows with a null pr_id (sorted last) come out in the final chunks.
+    """
+    if columns is not None and "pr_id" not in columns:
+        columns = ["pr_id"] + list(columns)
+
+    carry = None
+    with fsspec.open(table_path(root, table), "rb") as f:
+        for batch in pq.ParquetFile(f).iter_batches(batch_size=batch_size, columns=columns):
+            chunk = batch.to_pandas()
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+                carry = None
+
+            valid = chunk["pr_id"].notna().to_numpy()
+            if not valid.all():
+                # Null pr_ids sort last, so every PR before them is complete
+                n_valid = int(valid.sum())
+                if n_valid:
+                    yield chunk.iloc[:n_valid].reset_index(drop=True)
+                yield chunk.iloc[n_valid:].reset_index(drop=True)
+                continue
+
+            # Hold back the trailing PR: it may continue in the next batch
+            pr_ids = chunk["pr_id"].to_numpy(dtype="int64")
+            tail = int(np.searchsorted(pr_ids, pr_ids[-1], side="left"))
+            carry = chunk.iloc[tail:]
+            if tail:
+                yield chunk.iloc[:tail].reset_index(drop=True)
+
+    if carry is not None and len(carry):
+        yield carry.reset_index(drop=True)
+
+
+def stream_pr_aggregate(root, table, func, columns=None, batch_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Apply a per-PR aggregation ``func`` (e.g. ``extract_test_files``) chunk by
+    chunk over a clustered table and concatenate the results — a streaming
+    merge that never holds the whole table in memory.
+    """
+    if columns is not None and "pr_id" not in columns:
+        columns = ["pr_id"] + list(columns)
+
+    parts = [func(chunk) for chunk in iter_pr_chunks(root, table, columns, batch_size)]
+    if not parts:
+        return func(_empty_frame(root, table, columns))
+    return pd.concat(parts, ignore_index=True)
+
+
+# ============================
+# MAIN ENTRYPOINT
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rewrite AIDev per-PR tables clustered by pr_id.")
+    parser.add_argument("--src", default=DATA_ROOT, help="Source dataset root (ending in '/').")
+    parser.add_argument("--dst", default=CLUSTERED_ROOT, help="Output directory (ending in '/').")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args(argv)
+
+    cluster_by_pr_id(args.src, args.dst, row_group_size=args.row_group_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,29 @@
+
 # src/utils/plotting.py
+import hashlib
+import json
 import os
+import threading
+
+import matplotlib as mpl
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from src.msr2026.utils.cache import hash_code
+
+
+# Per-directory manifest of figure fingerprints (name → fingerprint)
+RENDER_CACHE_FILE = ".render_cache.json"
+
+# Set MSR2026_FORCE_RENDER=1 to ignore the render cache
+FORCE_RENDER = os.environ.get("MSR2026_FORCE_RENDER", "") not in ("", "0")
+
+# rcParams that do not affect the saved files
+_VOLATILE_RC_KEYS = ("backend", "interactive", "savefig.directory", "webagg.")
+
+_manifest_lock = threading.Lock()
 
 
 def ensure_dir(path: str):
@@ -8,16 +31,121 @@ def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
-def save_fig(fig_dir: str, name: str):
+# ============================
+# Figure Fingerprints
+# ============================
+def _hash_value(h, value):
+    if isinstance(value, pd.DataFrame):
+        h.update(repr((list(value.columns), value.index.names, value.dtypes.to_dict())).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(repr((value.name, value.index.names, value.dtype)).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.shape, value.dtype.str)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif callable(value) and hasattr(value, "__code__"):
+        # Plotting code itself: re-render when the function body, the names it
+        # calls or reads (e.g. plt.xlabel, HEATMAP_CMAP) or its defaults change
+        hash_code(h, value.__code__)
+        h.update(repr((value.__defaults__, value.__kwdefaults__)).encode())
+    else:
+        h.update(json.dumps(value, sort_keys=True, default=repr).encode())
+
+
+def style_fingerprint():
+    """
+    Hash of the active matplotlib style (rcParams such as RQ3's ACM settings)
+    and the matplotlib/seaborn versions doing the drawing.
+    """
+    rc = {k: repr(v) for k, v in mpl.rcParams.items() if not k.startswith(_VOLATILE_RC_KEYS)}
+    payload = json.dumps(rc, sort_keys=True) + mpl.__version__ + sns.__version__
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def figure_fingerprint(*data, **params):
+    """
+    Fingerprint a figure from its input tables, plotting function(s), plot
+    parameters (titles, colors, ...) and the current matplotlib style.
+    """
+    h = hashlib.sha256()
+    for value in data:
+        _hash_value(h, value)
+    _hash_value(h, params)
+    h.update(style_fingerprint().encode())
+    return h.hexdigest()
+
+
+# ============================
+# Render Cache
+# ============================
+def _manifest_path(fig_dir):
+    return os.path.join(fig_dir, RENDER_CACHE_FILE)
+
+
+def _read_manifest(fig_dir):
+    try:
+        with open(_manifest_path(fig_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _record_fingerprint(fig_dir, name, fingerprint):
+    with _manifest_lock:
+        manifest = _read_manifest(fig_dir)
+        if fingerprint is None:
+            manifest.pop(name, None)
+        else:
+            manifest[name] = fingerprint
+        tmp = f"{_manifest_path(fig_dir)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, _manifest_path(fig_dir))
+
+
+def is_fresh(fig_dir: str, name: str, fingerprint: str) -> bool:
+    """True if both outputs of ``name`` exist and were rendered from ``fingerprint``."""
+    if FORCE_RENDER:
+        return False
+    outputs_exist = all(
+        os.path.exists(os.path.join(fig_dir, f"{name}.{ext}")) for ext in ("png", "pdf")
+    )
+    return outputs_exist and _read_manifest(fig_dir).get(name) == fingerprint
+
+
+def skip_if_fresh(fig_dir: str, name: str, fingerprint: str) -> bool:
+    """Check the render cache, logging when a figure is skipped."""
+    if is_fresh(fig_dir, name, fingerprint):
+        print(f"✔ {name} unchanged — skipped re-rendering")
+        return True
+    return False
+
+
+def save_fig(fig_dir: str, name: str, fingerprint: str = None):
     """
     Save a figure to PNG and PDF formats (ACM-ready).
-    Automatically creates the directory if needed.
+    Automatically creates the directory if needed. Both files are written to
+    temporary paths first and moved into place, so readers never see partial
+    output; ``fingerprint`` (see ``figure_fingerprint``) is recorded in the
+    render cache.
     """
     ensure_dir(fig_dir)
 
     png_path = os.path.join(fig_dir, f"{name}.png")
     pdf_path = os.path.join(fig_dir, f"{name}.pdf")
+    png_tmp, pdf_tmp = f"{png_path}.tmp", f"{pdf_path}.tmp"
+
+    try:
+        plt.savefig(png_tmp, format="png", dpi=300, bbox_inches="tight")
+        plt.savefig(pdf_tmp, format="pdf", bbox_inches="tight")
+        os.replace(png_tmp, png_path)
+        os.replace(pdf_tmp, pdf_path)
+    finally:
+        plt.close()
+        for tmp in (png_tmp, pdf_tmp):
+            if os.path.exists(tmp):
+                os.remove(tmp)
 
-    plt.savefig(png_path, dpi=300, bbox_inches="tight")
-    plt.savefig(pdf_path, bbox_inches="tight")
-    plt.close()
+    # Figures saved without a fingerprint are never considered fresh
+    _record_fingerprint(fig_dir, name, fingerprint)
@@ -0,0 +1,471 @@
+# ============================================================
+# Resumable Concurrent Prefetch of AIDev Dataset Files
+# MSR 2026 Challenge Track Artifact Version (Network-based)
+# ============================================================
+#
+# Downloads every file the RQ pipelines need into a local directory with a
+# thread pool, in RQ order, so later RQs' files arrive while earlier RQs are
+# still computing. Each file is fetched in chunked HTTP range requests into a
+# ``.part`` file; interrupted transfers resume from the bytes already on disk
+# and failed chunks are retried with exponential backoff.
+#
+# ``hf://`` roots are pinned to the commit their revision points to when the
+# prefetcher is created, and files are stored per commit. For other HTTP
+# roots, partial and completed files carry the server's validator (ETag or
+# Last-Modified): resumes send ``If-Range`` and cached files are re-checked,
+# so bytes of different file versions are never mixed or silently reused.
+#
+# Usage:
+#   prefetcher = Prefetcher().start()
+#   session = AIDevSession(prefetcher=prefetcher)   # loaders wait per file
+#
+#   python -m src.msr2026.utils.prefetch                      # warm the cache
+#   python -m src.msr2026.utils.prefetch --serve ../data/x/   # local stand-in server
+
+import argparse
+import email.utils
+import http.client
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from src.msr2026.utils.cache import all_files, root_key
+
+
+# ============================
+# Constants
+# ============================
+DATA_ROOT = "hf://datasets/hao-li/AIDev/"
+PREFETCH_DIR = "../data/aidev_prefetch/"
+
+DEFAULT_WORKERS = 4
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+DEFAULT_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+TIMEOUT_SECONDS = 60
+
+VALIDATOR_SUFFIX = ".etag"
+
+_HF_ROOT = re.compile(r"^hf://datasets/(?P<repo>[^@]+?)(?:@(?P<rev>[^/]+))?/?$")
+_COMMIT_SHA = re.compile(r"^[0-9a-f]{40}$")
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+TRANSIENT_ERRORS = (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError)
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a download when the prefetcher is shut down."""
+
+
+def http_base_url(data_root):
+    """HTTP(S) base URL for a dataset root (``hf://`` roots resolve via the Hub)."""
+    match = _HF_ROOT.match(data_root)
+    if match:
+        rev = urllib.parse.quote(match.group("rev") or "main", safe="")
+        return f"https://huggingface.co/datasets/{match.group('repo')}/resolve/{rev}/"
+    if data_root.startswith(("http://", "https://")):
+        return data_root if data_root.endswith("/") else data_root + "/"
+    raise ValueError(f"prefetch needs an hf:// or http(s):// dataset root, got {data_root!r}")
+
+
+def pin_revision(data_root, retries=DEFAULT_RETRIES):
+    """
+    Pin an ``hf://`` root to the commit its revision (default: ``main``)
+    currently points to. Returns ``(root, pinned)``; other roots are returned
+    unchanged with ``pinned=False``.
+    """
+    match = _HF_ROOT.match(data_root)
+    if not match:
+        return data_root, False
+
+    repo, rev = match.group("repo"), match.group("rev") or "main"
+    if not _COMMIT_SHA.match(rev):
+        url = f"https://huggingface.co/api/datasets/{repo}/revision/{urllib.parse.quote(rev, safe='')}"
+
+        def resolve():
+            with _open(url) as resp:
+                return json.load(resp)["sha"]
+
+        rev = _with_retries(url, retries, resolve)
+    return f"hf://datasets/{repo}@{rev}/", True
+
+
+# ============================
+# HTTP Helpers
+# ============================
+class _CrossHostRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Follows redirects, but never forwards ``Authorization`` to another host (e.g. the Hub's CDN)."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        new = super().redirect_request(req, fp, code, msg, headers, newurl)
+        if new is not None:
+            old_url, new_url = urllib.parse.urlsplit(req.full_url), urllib.parse.urlsplit(new.full_url)
+            if (old_url.scheme, old_url.netloc.lower()) != (new_url.scheme, new_url.netloc.lower()):
+                new.remove_header("Authorization")
+        return new
+
+
+_OPENER = urllib.request.build_opener(_CrossHostRedirectHandler)
+
+
+def _open(url, headers=None):
+    headers = {"User-Agent": "msr2026-prefetch", **(headers or {})}
+    token = os.environ.get("HF_TOKEN")
+    if token and urllib.parse.urlsplit(url).hostname == "huggingface.co":
+        headers["Authorization"] = f"Bearer {token}"
+    return _OPENER.open(urllib.request.Request(url, headers=headers), timeout=TIMEOUT_SECONDS)
+
+
+def _request(url, start, end, if_range=None):
+    headers = {"Range": f"bytes={start}-{end}"}
+    if if_range:
+        headers["If-Range"] = if_range
+    return _open(url, headers)
+
+
+def _validator(headers):
+    """Strong identity of the served file version (ETag, else Last-Modified)."""
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def _total_size(resp):
+    match = _CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+    if match and match.group(3) != "*":
+        return int(match.group(3))
+    if resp.status == HTTPStatus.OK:
+        return int(resp.headers.get("Content-Length", -1))
+    return -1
+
+
+def _read_validator(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_validator(path, validator):
+    if validator:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(validator)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _discard(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _with_retries(url, retries, func):
+    failures = 0
+    while True:
+        try:
+            return func()
+        except urllib.error.HTTPError as exc:
+            if exc.code < 500 and exc.code != HTTPStatus.TOO_MANY_REQUESTS:
+                raise
+            failures = _backoff(url, exc, failures, retries)
+        except TRANSIENT_ERRORS as exc:
+            failures = _backoff(url, exc, failures, retries)
+
+
+def _backoff(url, exc, failures, retries):
+    failures += 1
+    if failures > retries:
+        raise IOError(f"giving up on {url} after {retries} retries") from exc
+    delay = BACKOFF_SECONDS * 2 ** (failures - 1)
+    print(f"[prefetch] {os.path.basename(url)}: {exc} — retry {failures}/{retries} in {delay:.0f}s")
+    time.sleep(delay)
+    return failures
+
+
+# ============================
+# Resumable Range Download
+# ============================
+def download_file(url, dst, chunk_size=DEFAULT_CHUNK_SIZE, retries=DEFAULT_RETRIES, stop=None):
+    """
+    Download ``url`` to ``dst`` in range requests of ``chunk_size`` bytes,
+    resuming from ``dst + ".part"`` and retrying transient failures.
+
+    The validator of the bytes in the ``.part`` file is kept next to it and
+    sent as ``If-Range``: if the file changed upstream the server answers with
+    the full body and the download restarts from zero. Setting ``stop`` (a
+    ``threading.Event``) aborts with ``DownloadCancelled``, keeping the
+    ``.part`` file for a later resume.
+    """
+    part = f"{dst}.part"
+    part_validator = part + VALIDATOR_SUFFIX
+
+    validator = _read_validator(part_validator)
+    if validator is None:
+        # Bytes of unknown origin cannot be resumed safely
+        _discard(part)
+
+    total = None
+    failures = 0
+
+    while True:
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        if total is not None and offset >= total:
+            break
+
+        try:
+            with _request(url, offset, offset + chunk_size - 1, validator if offset else None) as resp:
+                current = _validator(resp.headers)
+
+                if resp.status == HTTPStatus.PARTIAL_CONTENT and offset and current != validator:
+                    # Changed upstream and the server ignored If-Range: start over
+                    _discard(part, part_validator)
+                    validator, total = None, None
+                    continue
+
+                if resp.status == HTTPStatus.PARTIAL_CONTENT:
+                    mode = "ab"
+                else:
+                    # Full body: no Range support, or If-Range failed (file changed)
+                    mode = "wb"
+                total = _total_size(resp)
+                if total < 0:
+                    total = None
+
+                if offset == 0 or mode == "wb":
+                    validator = current
+                    _write_validator(part_validator, validator)
+
+                with open(part, mode) as out:
+                    while True:
+                        if stop is not None and stop.is_set():
+                            raise DownloadCancelled(url)
+                        block = resp.read1(1024 * 1024)
+                        if not block:
+                            break
+                        out.write(block)
+
+                if mode == "wb":
+                    if total is None:
+                        total = os.path.getsize(part)
+                    elif os.path.getsize(part) != total:
+                        raise ConnectionError(f"incomplete body for {url}")
+                    break
+            failures = 0
+
+        except urllib.error.HTTPError as exc:
+            if exc.code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE and offset > 0:
+                # Offset is at (or past) the end of the same file version
+                if _validator(exc.headers) in (None, validator):
+                    total = offset
+                    break
+                _discard(part, part_validator)
+                validator, total = None, None
+                continue
+            if exc.code < 500 and exc.code != HTTPStatus.TOO_MANY_REQUESTS:
+                raise
+            failures = _backoff(url, exc, failures, retries)
+        except TRANSIENT_ERRORS as exc:
+            failures = _backoff(url, exc, failures, retries)
+
+    if total is not None and os.path.getsize(part) != total:
+        raise IOError(f"size mismatch for {url}: {os.path.getsize(part)} != {total}")
+    os.replace(part, dst)
+    _write_validator(dst + VALIDATOR_SUFFIX, validator)
+    _discard(part_validator)
+    return dst
+
+
+def is_current(url, dst, retries=DEFAULT_RETRIES):
+    """True if the downloaded ``dst`` is still the version served at ``url``."""
+    stored = _read_validator(dst + VALIDATOR_SUFFIX)
+
+    def check():
+        with _request(url, 0, 0) as resp:
+            current = _validator(resp.headers)
+            if stored or current:
+                return current == stored
+            return _total_size(resp) == os.path.getsize(dst)
+
+    return _with_retries(url, retries, check)
+
+
+# ============================
+# Prefetcher
+# ============================
+class Prefetcher:
+    """
+    Background downloader for the files of ``rqs`` (RQ order is download
+    order). ``wait(name)`` blocks until one file is local; ``local_root`` can
+    then be used as a ``data_root``. ``data_root`` is the pinned root the
+    files were taken from (``hf://datasets/<repo>@<commit>/`` for the Hub).
+    """
+
+    def __init__(self, data_root=DATA_ROOT, cache_dir=PREFETCH_DIR, rqs=("rq1", "rq2", "rq3"),
+                 workers=DEFAULT_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE, retries=DEFAULT_RETRIES):
+        self.data_root, self.pinned = pin_revision(data_root, retries)
+        if self.pinned:
+            print(f"[prefetch] {data_root} → {self.data_root}")
+        self.base_url = http_base_url(self.data_root)
+        self.local_root = os.path.join(cache_dir, root_key(self.data_root)) + os.sep
+        self.files = all_files(rqs)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self._stop = threading.Event()
+        self._pool = None
+        self._futures = {}
+
+    def start(self):
+        os.makedirs(self.local_root, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+        for name in self.files:
+            self._futures[name] = self._pool.submit(self._fetch, name)
+        return self
+
+    def _fetch(self, name):
+        url = f"{self.base_url}{name}.parquet"
+        dst = f"{self.local_root}{name}.parquet"
+        if os.path.exists(dst):
+            # Files of a pinned commit never change; others are re-validated
+            if self.pinned or is_current(url, dst, self.retries):
+                return dst
+            print(f"[prefetch] {name} changed upstream — downloading again")
+            _discard(dst, dst + VALIDATOR_SUFFIX)
+
+        start = time.perf_counter()
+        download_file(url, dst, self.chunk_size, self.retries, stop=self._stop)
+        size_mb = os.path.getsize(dst) / 1024 ** 2
+        print(f"[prefetch] ✔ {name} ({size_mb:,.1f} MB in {time.perf_counter() - start:.1f}s)")
+        return dst
+
+    def wait(self, name):
+        """Block until ``name`` is downloaded and return its local path."""
+        if name not in self._futures:
+            raise KeyError(f"{name!r} is not scheduled for prefetch")
+        return self._futures[name].result()
+
+    def wait_all(self):
+        return {name: self.wait(name) for name in self.files}
+
+    def shutdown(self):
+        """Cancel pending and in-flight downloads (partial files stay resumable)."""
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+# ============================
+# Local HTTP Stand-in Server
+# ============================
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Static file handler with single-range ``Range`` support (206 responses),
+    an ETag per file version and ``If-Range`` handling.
+    """
+
+    def send_head(self):
+        self._range_remaining = None
+        self._etag = None
+
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            st = os.stat(path)
+            self._etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+        match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if if_range and self._etag:
+            last_modified = email.utils.formatdate(st.st_mtime, usegmt=True)
+            if if_range not in (self._etag, last_modified):
+                match = None  # changed since the client's copy: send the full file
+        if not match or self._etag is None:
+            return super().send_head()
+
+        size = st.st_size
+        start = int(match.group(1))
+        end = min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+        if start >= size:
+            self.send_error(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            return None
+
+        f = open(path, "rb")
+        f.seek(start)
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self._range_remaining = end - start + 1
+        return f
+
+    def end_headers(self):
+        if getattr(self, "_etag", None):
+            self.send_header("ETag", self._etag)
+        super().end_headers()
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, "_range_remaining", None)
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+        while remaining > 0:
+            block = source.read(min(1024 * 1024, remaining))
+            if not block:
+                break
+            outputfile.write(block)
+            remaining -= len(block)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def make_standin_server(directory, host="127.0.0.1", port=0):
+    """HTTP server exposing a local AIDev mirror; root URL is ``http://host:port/``."""
+    return ThreadingHTTPServer((host, port), partial(RangeRequestHandler, directory=directory))
+
+
+# ============================
+# MAIN ENTRYPOINT
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefetch AIDev files, or serve a local mirror.")
+    parser.add_argument("--data-root", default=DATA_ROOT)
+    parser.add_argument("--cache-dir", default=PREFETCH_DIR)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--serve", metavar="DIR", help="Serve DIR over HTTP with Range support instead.")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        server = make_standin_server(args.serve, port=args.port)
+        print(f"✔ Serving {args.serve} at http://127.0.0.1:{server.server_address[1]}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+        return
+
+    with Prefetcher(args.data_root, args.cache_dir, workers=args.workers) as prefetcher:
+        paths = prefetcher.wait_all()
+    print(f"✔ {len(paths)} files available in {prefetcher.local_root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# Shared pytest setup: import the package as ``src.msr2026`` (as the pipeline
+# scripts do) and run from a scratch directory, so the RQ modules' relative
+# ``../output`` folders are created outside the repository.
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_WORKDIR = os.path.join(tempfile.mkdtemp(prefix="msr2026-tests-"), "src")
+os.makedirs(_WORKDIR)
+os.chdir(_WORKDIR)
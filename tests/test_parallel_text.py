@@ -0,0 +1,62 @@
+# RQ2: the parallel comment pipeline must match the sequential one exactly.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.msr2026.rq2.parallel_text import clean_and_classify_parallel
+from src.msr2026.rq2.run_rq2 import apply_comment_rules, clean_comments
+
+BODIES = [
+    "Please fix this bug in the parser",
+    "Nit: naming style here, rename the variable",
+    "Could you add a unit test for this edge case?",
+    "Update the README description please",
+    "Sanitize this input to avoid injection",
+    "Looks good to me overall",
+    "+ added line from a diff",
+    "- removed line from a diff",
+    "@@ -1,3 +1,4 @@ hunk header",
+    "<div>markup block</div>",
+    "if (x) { return y; }",
+    "dependabot bumped the version here",
+    "See https://example.com for more details",
+    "Traceback shows an error: in the handler",
+    "ok",
+    "lgtm",
+    "First line about the test coverage\nsecond line mentions security",
+    "x" * 2500 + " long words here",
+    "",
+    None,
+]
+
+
+def synthetic_comments(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    bodies = [BODIES[i] for i in rng.integers(0, len(BODIES), n)]
+    created = pd.Series(pd.date_range("2025-01-01", periods=n, freq="37min").astype(str))
+    created[rng.random(n) < 0.05] = "not a date"
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "pr_id": pd.array(rng.integers(1, 400, n), dtype="Int64"),
+        "agent": rng.choice(["Devin", "Copilot", "Codex"], n),
+        "body": bodies,
+        "created_at": created,
+    })
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 777), (2, 777), (3, 777), (2, 50_000)])
+def test_parallel_matches_sequential(workers, chunk_size):
+    df = synthetic_comments()
+    expected = apply_comment_rules(clean_comments(df.copy()))
+    result = clean_and_classify_parallel(df, workers=workers, chunk_size=chunk_size)
+
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parallel_leaves_input_unmodified():
+    df = synthetic_comments(500)
+    before = df.copy()
+    clean_and_classify_parallel(df, workers=2, chunk_size=100)
+    pd.testing.assert_frame_equal(df, before)
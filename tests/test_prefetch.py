@@ -0,0 +1,238 @@
+# Prefetch: resumable range downloads against the local stand-in server.
+
+import io
+import json
+import os
+import threading
+
+import pytest
+
+from src.msr2026.utils import prefetch as P
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    """Stand-in server over ``tmp_path / "srv"``; yields (dir, root URL, Range log)."""
+    monkeypatch.setattr(P, "BACKOFF_SECONDS", 0.001)
+    ranges = []
+    send_head = P.RangeRequestHandler.send_head
+
+    def logged(self):
+        ranges.append((self.headers.get("Range"), self.headers.get("If-Range")))
+        return send_head(self)
+
+    monkeypatch.setattr(P.RangeRequestHandler, "send_head", logged)
+
+    directory = tmp_path / "srv"
+    directory.mkdir()
+    server = P.make_standin_server(str(directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield directory, f"http://127.0.0.1:{server.server_address[1]}/", ranges
+    server.shutdown()
+    server.server_close()
+
+
+def publish(directory, name, data, mtime):
+    path = directory / name
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def served_etag(url):
+    with P._request(url, 0, 0) as resp:
+        return P._validator(resp.headers)
+
+
+def test_download_in_chunks(served, tmp_path):
+    directory, root, ranges = served
+    data = os.urandom(100_000)
+    publish(directory, "a.parquet", data, 1_000_000)
+
+    dst = str(tmp_path / "a.parquet")
+    P.download_file(root + "a.parquet", dst, chunk_size=30_000)
+
+    assert open(dst, "rb").read() == data
+    assert [r for r, _ in ranges] == [f"bytes={s}-{s + 29_999}" for s in (0, 30_000, 60_000, 90_000)]
+    assert open(dst + P.VALIDATOR_SUFFIX).read() == served_etag(root + "a.parquet")
+    assert not os.path.exists(dst + ".part")
+
+
+def test_resume_from_part(served, tmp_path):
+    directory, root, ranges = served
+    data = os.urandom(100_000)
+    publish(directory, "a.parquet", data, 1_000_000)
+    url = root + "a.parquet"
+    etag = served_etag(url)
+
+    dst = str(tmp_path / "a.parquet")
+    with open(dst + ".part", "wb") as f:
+        f.write(data[:40_000])
+    with open(dst + ".part" + P.VALIDATOR_SUFFIX, "w") as f:
+        f.write(etag)
+    ranges.clear()
+
+    P.download_file(url, dst, chunk_size=1_000_000)
+
+    assert open(dst, "rb").read() == data
+    assert ranges == [("bytes=40000-1039999", etag)]
+
+
+def test_resume_after_dropped_connections(served, tmp_path, monkeypatch):
+    directory, root, _ = served
+    data = os.urandom(100_000)
+    publish(directory, "a.parquet", data, 1_000_000)
+
+    copyfile = P.RangeRequestHandler.copyfile
+    drops = iter([True, False, True, True, False])
+
+    def flaky(self, source, outputfile):
+        if next(drops, False):
+            outputfile.write(source.read(5_000))
+            raise ConnectionResetError("dropped")
+        return copyfile(self, source, outputfile)
+
+    monkeypatch.setattr(P.RangeRequestHandler, "copyfile", flaky)
+    dst = str(tmp_path / "a.parquet")
+    P.download_file(root + "a.parquet", dst, chunk_size=30_000, retries=10)
+
+    assert open(dst, "rb").read() == data
+
+
+def test_if_range_restarts_changed_file(served, tmp_path):
+    directory, root, ranges = served
+    old = os.urandom(100_000)
+    publish(directory, "a.parquet", old, 1_000_000)
+    url = root + "a.parquet"
+    old_etag = served_etag(url)
+
+    dst = str(tmp_path / "a.parquet")
+    with open(dst + ".part", "wb") as f:
+        f.write(old[:40_000])
+    with open(dst + ".part" + P.VALIDATOR_SUFFIX, "w") as f:
+        f.write(old_etag)
+
+    new = os.urandom(120_000)
+    publish(directory, "a.parquet", new, 2_000_000)
+    ranges.clear()
+
+    P.download_file(url, dst, chunk_size=1_000_000)
+
+    assert open(dst, "rb").read() == new
+    assert ranges[0] == ("bytes=40000-1039999", old_etag)
+    assert open(dst + P.VALIDATOR_SUFFIX).read() == served_etag(url) != old_etag
+
+
+def test_part_without_validator_is_discarded(served, tmp_path):
+    directory, root, ranges = served
+    data = os.urandom(50_000)
+    publish(directory, "a.parquet", data, 1_000_000)
+
+    dst = str(tmp_path / "a.parquet")
+    with open(dst + ".part", "wb") as f:
+        f.write(b"x" * 10_000)
+
+    P.download_file(root + "a.parquet", dst)
+
+    assert open(dst, "rb").read() == data
+    assert ranges[0][0].startswith("bytes=0-")
+
+
+def test_is_current_detects_upstream_change(served, tmp_path):
+    directory, root, _ = served
+    publish(directory, "a.parquet", os.urandom(10_000), 1_000_000)
+    dst = str(tmp_path / "a.parquet")
+    P.download_file(root + "a.parquet", dst)
+
+    assert P.is_current(root + "a.parquet", dst)
+    publish(directory, "a.parquet", os.urandom(10_000), 2_000_000)
+    assert not P.is_current(root + "a.parquet", dst)
+
+
+def test_stop_keeps_part_for_resume(served, tmp_path):
+    directory, root, _ = served
+    data = os.urandom(50_000)
+    publish(directory, "a.parquet", data, 1_000_000)
+    dst = str(tmp_path / "a.parquet")
+
+    stop = threading.Event()
+    stop.set()
+    with pytest.raises(P.DownloadCancelled):
+        P.download_file(root + "a.parquet", dst, stop=stop)
+    assert os.path.exists(dst + ".part" + P.VALIDATOR_SUFFIX)
+
+    P.download_file(root + "a.parquet", dst)
+    assert open(dst, "rb").read() == data
+
+
+def test_pin_revision(monkeypatch):
+    requested = []
+
+    def fake_open(url, headers=None):
+        requested.append(url)
+        return io.BytesIO(json.dumps({"sha": SHA}).encode())
+
+    monkeypatch.setattr(P, "_open", fake_open)
+
+    assert P.pin_revision("hf://datasets/hao-li/AIDev/") == (f"hf://datasets/hao-li/AIDev@{SHA}/", True)
+    assert requested == ["https://huggingface.co/api/datasets/hao-li/AIDev/revision/main"]
+
+    # Commit roots and plain HTTP roots need no lookup
+    assert P.pin_revision(f"hf://datasets/hao-li/AIDev@{SHA}/") == (f"hf://datasets/hao-li/AIDev@{SHA}/", True)
+    assert P.pin_revision("http://127.0.0.1:8000/") == ("http://127.0.0.1:8000/", False)
+    assert len(requested) == 1
+    assert P.http_base_url(f"hf://datasets/hao-li/AIDev@{SHA}/") == (
+        f"https://huggingface.co/datasets/hao-li/AIDev/resolve/{SHA}/"
+    )
+
+
+def test_pinned_files_are_not_revalidated(tmp_path, monkeypatch):
+    def offline(*args, **kwargs):
+        raise AssertionError("pinned cache must not hit the network")
+
+    monkeypatch.setattr(P, "_request", offline)
+    prefetcher = P.Prefetcher(f"hf://datasets/hao-li/AIDev@{SHA}/", str(tmp_path), rqs=("rq3",))
+    os.makedirs(prefetcher.local_root)
+    for name in prefetcher.files:
+        open(f"{prefetcher.local_root}{name}.parquet", "wb").close()
+
+    with prefetcher:
+        paths = prefetcher.wait_all()
+    assert sorted(paths) == sorted(prefetcher.files)
+
+
+def test_authorization_not_forwarded_to_other_hosts(tmp_path):
+    publish(tmp_path, "a.parquet", b"data", 1_000_000)
+    seen = []
+
+    class Redirecting(P.RangeRequestHandler):
+        def do_GET(self):
+            seen.append((self.path, self.headers.get("Authorization")))
+            port = self.server.server_address[1]
+            targets = {
+                "/same": f"http://127.0.0.1:{port}/a.parquet",
+                "/cross": f"http://localhost:{port}/a.parquet",
+            }
+            if self.path not in targets:
+                return super().do_GET()
+            self.send_response(302)
+            self.send_header("Location", targets[self.path])
+            self.end_headers()
+
+    server = P.ThreadingHTTPServer(("127.0.0.1", 0), P.partial(Redirecting, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for path in ("/same", "/cross"):
+            with P._open(base + path, {"Authorization": "Bearer secret"}) as resp:
+                assert resp.read() == b"data"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert seen == [
+        ("/same", "Bearer secret"), ("/a.parquet", "Bearer secret"),
+        ("/cross", "Bearer secret"), ("/a.parquet", None),
+    ]